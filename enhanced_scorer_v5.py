@@ -55,8 +55,11 @@
 """
 
 import logging
+import re
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple
-from collections import Counter
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -130,6 +133,20 @@ class CourseAnalyzer:
         },
     }
     
+    # 基準値の距離一覧（近似距離検索用に事前ソート）
+    SORTED_BASELINE_DISTANCES = {course: sorted(d) for course, d in BASELINE_3F.items()}
+    
+    @staticmethod
+    def nearest_distance(distances: List[int], distance: int) -> int:
+        """ソート済み距離一覧から最も近い距離を返す（等距離なら短い方）"""
+        idx = bisect_left(distances, distance)
+        if idx == 0:
+            return distances[0]
+        if idx == len(distances):
+            return distances[-1]
+        lower, upper = distances[idx - 1], distances[idx]
+        return lower if distance - lower <= upper - distance else upper
+    
     @staticmethod
     def detect_track_variant(course: str, distance: int, distance_text: str = '') -> str:
         """内外回りを判定"""
@@ -165,9 +182,10 @@ class CourseAnalyzer:
         return course
     
     @staticmethod
+    @lru_cache(maxsize=2048)
     def get_baseline_3f(course: str, distance: int, distance_text: str = '', 
                         baba: str = '良') -> float:
-        """上がり3Fの基準値を取得（馬場状態補正込み）"""
+        """上がり3Fの基準値を取得（馬場状態補正込み・引数ごとにキャッシュ）"""
         detailed_course = CourseAnalyzer.detect_track_variant(course, distance, distance_text)
         
         course_baselines = CourseAnalyzer.BASELINE_3F.get(detailed_course, {})
@@ -175,11 +193,11 @@ class CourseAnalyzer:
         if distance in course_baselines:
             baseline = course_baselines[distance]
         else:
-            distances = sorted(course_baselines.keys())
+            distances = CourseAnalyzer.SORTED_BASELINE_DISTANCES.get(detailed_course, [])
             if not distances:
                 baseline = 34.5 if distance <= 1800 else 35.5 if distance <= 2200 else 36.5
             else:
-                closest = min(distances, key=lambda x: abs(x - distance))
+                closest = CourseAnalyzer.nearest_distance(distances, distance)
                 baseline = course_baselines[closest]
                 diff = distance - closest
                 baseline += diff * 0.001
@@ -206,6 +224,9 @@ class RunningStyleAnalyzer:
         '中京': {'straight': 412, 'favor': ['差し']},
     }
     
+    # 直線の長さだけを引く展開予測・相性補正用
+    STRAIGHT_LENGTHS = {course: info['straight'] for course, info in COURSE_CHARACTERISTICS.items()}
+    
     # 【新設】コース×距離別の脚質ボーナスウェイト
     COURSE_DISTANCE_STYLE_WEIGHTS = {
         '東京': {
@@ -254,8 +275,11 @@ class RunningStyleAnalyzer:
         },
     }
     
+    # ウェイト定義のある距離一覧（近似距離検索用に事前ソート）
+    SORTED_STYLE_WEIGHT_DISTANCES = {course: sorted(d) for course, d in COURSE_DISTANCE_STYLE_WEIGHTS.items()}
+    
     @staticmethod
-    def classify_running_style(passing_positions: List[int], field_sizes: List[int] = None) -> Dict:
+    def classify_running_style(passing_positions: List[int], field_sizes: Optional[List[int]] = None) -> Dict:
         """通過順位履歴から脚質を判定"""
         if not passing_positions:
             return {'style': '不明', 'confidence': 0.0, 'avg_position': 0.0, 'avg_position_rate': 0.0}
@@ -292,9 +316,17 @@ class RunningStyleAnalyzer:
             'races_analyzed': len(passing_positions)
         }
     
+    # 前残り率によるペース判定の閾値: (直線区分, 16頭以上か) → (ハイ上限, ミドル上限)
+    PACE_FRONT_RATIO_THRESHOLDS = {
+        ('long', True): (0.30, 0.50), ('long', False): (0.25, 0.45),
+        ('short', True): (0.20, 0.40), ('short', False): (0.15, 0.35),
+        ('standard', True): (0.25, 0.45), ('standard', False): (0.20, 0.40),
+    }
+    PACE_LABELS = ('ハイ', 'ミドル', 'スロー')
+    
     @staticmethod
-    def predict_race_pace(horses_running_styles: List[Dict], field_size: int = None, 
-                         course: str = None) -> Dict:
+    def predict_race_pace(horses_running_styles: List[Dict], field_size: Optional[int] = None, 
+                         course: Optional[str] = None) -> Dict:
         """
         【改善版】レース展開を予測（コース特性を考慮）
         
@@ -322,73 +354,34 @@ class RunningStyleAnalyzer:
         if field_size is None:
             field_size = len(horses_running_styles)
         
-        # 脚質ごとのカウント
-        style_counts = Counter(h['style'] for h in horses_running_styles if h.get('style'))
+        # 脚質ごとのカウントと逃げ馬の質（信頼度0.8以上の逃げ馬がいるか）を1回の走査で求める
+        style_counts = {'逃げ': 0, '先行': 0, '差し': 0, '追込': 0}
+        strong_escaper = False
+        for h in horses_running_styles:
+            style = h.get('style')
+            if style in style_counts:
+                style_counts[style] += 1
+                if style == '逃げ' and not strong_escaper and h.get('confidence', 0) >= 0.8:
+                    strong_escaper = True
         
         # 前走組（逃げ+先行）の数と割合
         front_runners = style_counts['逃げ'] + style_counts['先行']
         front_ratio = front_runners / field_size if field_size > 0 else 0.0
         
-        # 逃げ馬の質を評価
-        escapers = [h for h in horses_running_styles if h.get('style') == '逃げ']
-        strong_escaper = any(h.get('confidence', 0) >= 0.8 for h in escapers)
-        
         # 【新】コース特性を考慮
-        straight_length = 400  # デフォルト
-        if course and course in RunningStyleAnalyzer.COURSE_CHARACTERISTICS:
-            straight_length = RunningStyleAnalyzer.COURSE_CHARACTERISTICS[course]['straight']
+        straight_length = RunningStyleAnalyzer.STRAIGHT_LENGTHS.get(course, 400)  # 未登録コースは400m
         
         # 【改善】直線の長さに応じて判定基準を変更
-        if straight_length >= 500:  # 東京・新潟（長い直線）
-            # 長い直線→差し・追込が届きやすい
-            if field_size >= 16:
-                if front_ratio < 0.30:
-                    pace = 'ハイ'
-                elif front_ratio < 0.50:
-                    pace = 'ミドル'
-                else:
-                    pace = 'スロー'
-            else:
-                if front_ratio < 0.25:
-                    pace = 'ハイ'
-                elif front_ratio < 0.45:
-                    pace = 'ミドル'
-                else:
-                    pace = 'スロー'
-        
-        elif straight_length <= 350:  # 中山・小倉・福島（短い直線）
-            # 短い直線→前残りしやすい
-            if field_size >= 16:
-                if front_ratio < 0.20:
-                    pace = 'ハイ'
-                elif front_ratio < 0.40:
-                    pace = 'ミドル'
-                else:
-                    pace = 'スロー'
-            else:
-                if front_ratio < 0.15:
-                    pace = 'ハイ'
-                elif front_ratio < 0.35:
-                    pace = 'ミドル'
-                else:
-                    pace = 'スロー'
-        
-        else:  # 京都・阪神・中京（標準的な直線）
-            # 従来の判定ロジック
-            if field_size >= 16:
-                if front_ratio < 0.25:
-                    pace = 'ハイ'
-                elif front_ratio < 0.45:
-                    pace = 'ミドル'
-                else:
-                    pace = 'スロー'
-            else:
-                if front_ratio < 0.20:
-                    pace = 'ハイ'
-                elif front_ratio < 0.40:
-                    pace = 'ミドル'
-                else:
-                    pace = 'スロー'
+        if straight_length >= 500:  # 東京・新潟（長い直線）→差し・追込が届きやすい
+            straight_band = 'long'
+        elif straight_length <= 350:  # 中山・小倉・福島（短い直線）→前残りしやすい
+            straight_band = 'short'
+        else:  # 京都・阪神・中京（標準的な直線）→従来の判定ロジック
+            straight_band = 'standard'
+        
+        # 前残り率が閾値未満ならハイ、次の閾値未満ならミドル、それ以上はスロー
+        thresholds = RunningStyleAnalyzer.PACE_FRONT_RATIO_THRESHOLDS[(straight_band, field_size >= 16)]
+        pace = RunningStyleAnalyzer.PACE_LABELS[bisect_right(thresholds, front_ratio)]
         
         # 逃げ馬の質による補正
         if strong_escaper and style_counts['逃げ'] == 1:
@@ -398,12 +391,7 @@ class RunningStyleAnalyzer:
         confidence = min(len(horses_running_styles) / field_size, 1.0) if field_size > 0 else 0.0
         
         # 【追加】後方互換性のためdistributionを含める
-        distribution = {
-            '逃げ': style_counts.get('逃げ', 0),
-            '先行': style_counts.get('先行', 0),
-            '差し': style_counts.get('差し', 0),
-            '追込': style_counts.get('追込', 0)
-        }
+        distribution = style_counts
         
         return {
             'pace': pace,
@@ -415,6 +403,14 @@ class RunningStyleAnalyzer:
             'distribution': distribution  # 追加
         }
     
+    # 脚質×展開の基本ボーナス（表にない脚質は PACE_STYLE_DEFAULT_BONUS、なければ0点）
+    PACE_STYLE_BONUS = {
+        'ハイ': {'差し': 8.0, '追込': 8.0, '先行': 3.0},
+        'スロー': {'逃げ': 8.0, '先行': 8.0, '差し': 3.0},
+        'ミドル': {'先行': 5.0, '差し': 5.0},
+    }
+    PACE_STYLE_DEFAULT_BONUS = {'ミドル': 2.0}
+    
     @staticmethod
     def calculate_style_match_bonus(style: str, pace: str, course: str, distance: int) -> float:
         """
@@ -427,29 +423,16 @@ class RunningStyleAnalyzer:
         if not style or not pace:
             return 0.0
         
-        bonus = 0.0
-        
         # 基本ボーナス（ペース×脚質）
-        if pace == 'ハイ':
-            if style in ['差し', '追込']:
-                bonus += 8.0
-            elif style == '先行':
-                bonus += 3.0
-        elif pace == 'スロー':
-            if style in ['逃げ', '先行']:
-                bonus += 8.0
-            elif style == '差し':
-                bonus += 3.0
-        elif pace == 'ミドル':
-            if style in ['先行', '差し']:
-                bonus += 5.0
-            else:
-                bonus += 2.0
+        pace_bonus = RunningStyleAnalyzer.PACE_STYLE_BONUS.get(pace)
+        if pace_bonus is None:
+            bonus = 0.0
+        else:
+            bonus = pace_bonus.get(style, RunningStyleAnalyzer.PACE_STYLE_DEFAULT_BONUS.get(pace, 0.0))
         
         # 【新】直線の長さによる補正
-        if course in RunningStyleAnalyzer.COURSE_CHARACTERISTICS:
-            straight = RunningStyleAnalyzer.COURSE_CHARACTERISTICS[course]['straight']
-            
+        straight = RunningStyleAnalyzer.STRAIGHT_LENGTHS.get(course)
+        if straight is not None:
             if straight >= 500:  # 長い直線
                 if style in ['差し', '追込'] and pace in ['ハイ', 'ミドル']:
                     bonus += 5.0
@@ -465,9 +448,10 @@ class RunningStyleAnalyzer:
         return bonus
     
     @staticmethod
+    @lru_cache(maxsize=1024)
     def get_style_weight(course: str, distance: int, style: str) -> float:
         """
-        【新設】コース×距離別の脚質ボーナスウェイトを取得
+        【新設】コース×距離別の脚質ボーナスウェイトを取得（引数ごとにキャッシュ）
         
         Returns:
             脚質ボーナスのウェイト（0.0～0.20）
@@ -485,8 +469,8 @@ class RunningStyleAnalyzer:
                 return 0.05
         
         # 距離に最も近いウェイトを取得
-        distances = sorted(course_weights.keys())
-        closest_distance = min(distances, key=lambda d: abs(d - distance))
+        distances = RunningStyleAnalyzer.SORTED_STYLE_WEIGHT_DISTANCES[course]
+        closest_distance = CourseAnalyzer.nearest_distance(distances, distance)
         distance_weights = course_weights[closest_distance]
         
         return distance_weights.get(style, 0.10)
@@ -495,23 +479,99 @@ class RunningStyleAnalyzer:
 class EnhancedRaceScorer:
     """競馬レーススコアラー（東京新聞杯対応版）"""
     
-    central_courses = ['東京', '中山', '京都', '阪神', '小倉', '新潟', '中京', '札幌', '函館', '福島']
-    local_dirt_courses = ['大井', '川崎', '船橋', '浦和', '盛岡', '水沢', '門別', '帯広', '笠松', '金沢', '名古屋', '園田', '姫路', '高知', '佐賀']
-    local_turf_courses = []
+    central_courses = frozenset({'東京', '中山', '京都', '阪神', '小倉', '新潟', '中京', '札幌', '函館', '福島'})
+    local_dirt_courses = frozenset({'大井', '川崎', '船橋', '浦和', '盛岡', '水沢', '門別', '帯広', '笠松', '金沢', '名古屋', '園田', '姫路', '高知', '佐賀'})
+    local_turf_courses = frozenset()
+    all_local_courses = local_dirt_courses | local_turf_courses
+    
+    # 危険フラグの初期値（reasonsは呼び出しごとに新しいリストを付与する）
+    DANGER_FLAGS_TEMPLATE = {
+        'is_dangerous': False,
+        'local_to_jra': False,
+        'track_switch_dart_to_turf': False
+    }
+    
+    # 主要交流重賞（レース名で判定）
+    KOURYU_RACE_NAMES = [
+        '帝王賞', '東京大賞典', 'かしわ記念', 'JBCクラシック', 'JBCスプリント', 'JBCレディスクラシック',
+        'ジャパンダートダービー', 'エンプレス杯', 'マリーンC', 'スパーキングレディーC',
+        'さきたま杯', 'ブリーダーズゴールドC', 'ダイオライト記念', '名古屋グランプリ',
+        '黒船賞', 'マーキュリーC', 'ウィナーズカップ', 'ジャパンブリーダーズカップ',
+        'TCK女王盃', 'クラスターC', '東京スプリント', '全日本2歳優駿', 'ローレル賞'
+    ]
+    
+    # 斤量増ペナルティの1kgあたりレート: 1400m未満 / 1400m以上 / 1800m以上 / 2000m以上
+    WEIGHT_PENALTY_DISTANCES = (1400, 1800, 2000)
+    WEIGHT_PENALTY_RATES = (-1.5, -2.0, -2.5, -3.0)
+    
+    # 後半4F評価のレース格別信頼度（detect_race_gradeの信頼度とは別スケール）
+    LATE_4F_RELIABILITY = {
+        'G1': 1.0, 'G2': 0.95, 'G3': 0.9,
+        'JpnI': 1.0, 'JpnII': 0.95, 'JpnIII': 0.9,
+        'OP': 0.85
+    }
+    
+    # 上がり3F相対評価の基礎点: 速度差の下限（以上）ごとの点数
+    # 短距離（1400m以下）は1.3秒、それ以外は1.5秒差で満点
+    LAST_3F_SHORT_THRESHOLDS = (0.0, 0.4, 0.8, 1.3)
+    LAST_3F_LONG_THRESHOLDS = (0.0, 0.5, 1.0, 1.5)
+    LAST_3F_BASE_POINTS = (-3.0, 5.0, 8.0, 12.0, 15.0)  # 旧: -5/10/15/20/25
     
-    def __init__(self, debug_mode: bool = False):
+    # 直近3走の時間減衰（1.0 - idx * 0.15 / 斤量-タイム評価は 1.0 - idx * 0.25）
+    RECENT_TIME_DECAY = tuple(1.0 - (idx * 0.15) for idx in range(3))
+    WEIGHT_TIME_DECAY = tuple(1.0 - (idx * 0.25) for idx in range(3))
+    
+    # 後半4F基準値: 対象距離の上限（以下）ごと、末尾は2400m超
+    LATE_4F_BASELINE_DISTANCES = (2000, 2400)
+    LATE_4F_BASELINES = (47.2, 47.8, 48.3)
+    
+    # 斤量-タイム評価の距離別基準: 距離の上限（以下）ごとの (上がり3F基準, 斤量閾値)、末尾は1401〜1600m
+    WEIGHT_TIME_DISTANCES = (1200, 1400)
+    WEIGHT_TIME_BASELINES = ((34.0, 56.0), (34.3, 55.5), (34.5, 55.0))
+    
+    # 後半4F評価: 基準値との差分の下限（以上）ごとの倍率
+    LATE_4F_DIFF_THRESHOLDS = (-2.0, -0.5, 0.7, 1.5, 2.5, 3.5)
+    LATE_4F_MULTIPLIERS = (0.65, 0.85, 1.00, 1.15, 1.30, 1.50, 1.80)
+    
+    # 斤量-タイム評価のスピードボーナス: 基準との差の下限（以上）ごとの点数
+    WEIGHT_TIME_SPEED_THRESHOLDS = (-0.5, 0.0, 0.5, 1.0)
+    WEIGHT_TIME_SPEED_BONUS = (-3.0, 0.0, 2.0, 4.0, 6.0)
+    
+    # 上がり3F相対評価の着順ボーナス（重賞は2-5着でも一定の評価、該当なしは0点）
+    LAST_3F_FINISH_BONUS_GRADED = {1: 3.0, 2: 2.0, 3: 2.0, 4: 1.5, 5: 1.5}
+    LAST_3F_FINISH_BONUS = {1: 3.0, 2: 2.0, 3: 1.0}
+    
+    # 着順の上限（以下）ごとの係数（1着は別扱い）: 3着以内 / 5着以内 / 10着以内 / それ以下
+    FINISH_RANK_LIMITS = (3, 5, 10)
+    LATE_4F_FINISH_BONUS = (0.9, 0.75, 0.5, 0.3)        # 1着は1.0
+    WEIGHT_TIME_FINISH_FACTORS = (1.0, 0.85, 0.6, 0.3)  # 1着は1.2
+    
+    # min_score_cutoff指定時に足切りした馬のtotal_score
+    CUTOFF_TOTAL_SCORE = -999.0
+    
+    # 判定用の正規表現（1回のsearchで複数キーワードを走査）
+    LOCAL_CLASS_PATTERN = re.compile(r'C[123]|B[123]|A[12]')
+    KOURYU_PATTERN = re.compile(r'Jpn[I123]|' + '|'.join(map(re.escape, KOURYU_RACE_NAMES)))
+    # 重賞表記（G1〜G3 / GⅠ〜GⅢ / GI〜GIII）のいずれかを含むか
+    GRADE_PATTERN = re.compile(r'G[123IⅠⅡⅢ]')
+    
+    def __init__(self, debug_mode: bool = False) -> None:
         self.debug_mode = debug_mode
         self.course_analyzer = CourseAnalyzer()
         self.style_analyzer = RunningStyleAnalyzer()
     
-    def detect_race_grade(self, race_name: str) -> Tuple[str, float]:
-        """レースグレードを判定"""
-        if 'G1' in race_name or 'GⅠ' in race_name or 'GI' in race_name:
-            return ('G1', 1.2)
-        if 'G2' in race_name or 'GⅡ' in race_name or 'GII' in race_name:
-            return ('G2', 1.1)
-        if 'G3' in race_name or 'GⅢ' in race_name or 'GIII' in race_name:
-            return ('G3', 1.0)
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def detect_race_grade(race_name: str) -> Tuple[str, float]:
+        """レースグレードを判定（判定順が優先順位・同じレース名は再判定しない）"""
+        # 重賞表記がなければG1〜G3の個別判定は不要
+        if EnhancedRaceScorer.GRADE_PATTERN.search(race_name):
+            if 'G1' in race_name or 'GⅠ' in race_name or 'GI' in race_name:
+                return ('G1', 1.2)
+            if 'G2' in race_name or 'GⅡ' in race_name or 'GII' in race_name:
+                return ('G2', 1.1)
+            if 'G3' in race_name or 'GⅢ' in race_name or 'GIII' in race_name:
+                return ('G3', 1.0)
         if 'OP' in race_name or 'オープン' in race_name or 'リステッド' in race_name or 'L' == race_name.strip():
             return ('OP', 0.9)
         if '1600万' in race_name or '3勝' in race_name:
@@ -524,55 +584,48 @@ class EnhancedRaceScorer:
             return ('未勝利', 0.70)
         return ('その他', 0.65)
     
-    def _is_local_race(self, race_name: str, course: str) -> bool:
-        """地方レースかどうかを判定（交流重賞は除外）"""
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _is_local_race(race_name: str, course: str) -> bool:
+        """地方レースかどうかを判定（交流重賞は除外・(レース名, 競馬場)ごとにキャッシュ）"""
         # 交流重賞（JpnI/II/III）は地方競馬場開催でもJRA相当として扱う
-        if self._is_kouryu_grade_race(race_name):
+        if EnhancedRaceScorer._is_kouryu_grade_race(race_name):
             return False
         
-        if course in self.local_dirt_courses or course in self.local_turf_courses:
-            return True
-        if any(marker in race_name for marker in ['C1', 'C2', 'C3', 'B1', 'B2', 'B3', 'A1', 'A2']):
-            return True
-        return False
+        # 地方競馬場、またはクラス表記（C1/B2/A1等）があれば地方
+        return (course in EnhancedRaceScorer.all_local_courses
+                or EnhancedRaceScorer.LOCAL_CLASS_PATTERN.search(race_name) is not None)
     
-    def _is_kouryu_grade_race(self, race_name: str) -> bool:
+    @staticmethod
+    def _is_kouryu_grade_race(race_name: str) -> bool:
         """交流重賞（JpnI/II/III）かどうかを判定"""
-        # Jpnグレード表記がある場合
-        if any(grade in race_name for grade in ['JpnI', 'JpnII', 'JpnIII', 'Jpn1', 'Jpn2', 'Jpn3']):
-            return True
-        
-        # 主要交流重賞（レース名で判定）
-        kouryu_races = [
-            '帝王賞', '東京大賞典', 'かしわ記念', 'JBCクラシック', 'JBCスプリント', 'JBCレディスクラシック',
-            'ジャパンダートダービー', 'エンプレス杯', 'マリーンC', 'スパーキングレディーC',
-            'さきたま杯', 'ブリーダーズゴールドC', 'ダイオライト記念', '名古屋グランプリ',
-            '黒船賞', 'マーキュリーC', 'ウィナーズカップ', 'ジャパンブリーダーズカップ',
-            'TCK女王盃', 'クラスターC', '東京スプリント', '全日本2歳優駿', 'ローレル賞'
-        ]
-        
-        return any(race in race_name for race in kouryu_races)
+        # Jpnグレード表記、または主要交流重賞のレース名
+        return EnhancedRaceScorer.KOURYU_PATTERN.search(race_name) is not None
     
-    def _get_track_type_by_distance(self, distance: int, race_name: str, course: str) -> str:
-        """距離とレース名からトラックタイプを判定"""
-        if 'ダ' in race_name or 'ダート' in race_name:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _get_track_type_by_distance(distance: int, race_name: str, course: str) -> str:
+        """距離とレース名からトラックタイプを判定（引数ごとにキャッシュ）"""
+        if 'ダ' in race_name:  # 'ダート'表記も含む
             return 'ダート'
         if '芝' in race_name:
             return '芝'
         
-        if course in self.local_dirt_courses:
+        if course in EnhancedRaceScorer.local_dirt_courses:
             return 'ダート'
         
-        if course in self.local_turf_courses:
+        if course in EnhancedRaceScorer.local_turf_courses:
             return 'ダート' if distance <= 1400 else '芝'
         
-        if course in self.central_courses:
+        if course in EnhancedRaceScorer.central_courses:
             return '芝'
         
         return 'ダート' if distance <= 1400 else '芝'
     
-    def _get_default_baseline_3f(self, distance: int, track_type: str) -> float:
-        """距離とトラックタイプからデフォルトの上がり3F基準値を取得"""
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _get_default_baseline_3f(distance: int, track_type: str) -> float:
+        """距離とトラックタイプからデフォルトの上がり3F基準値を取得（引数ごとにキャッシュ）"""
         if track_type == 'ダート':
             if distance <= 1200:
                 return 36.0
@@ -594,9 +647,45 @@ class EnhancedRaceScorer:
             else:
                 return 37.0
     
+    def _decorate(self, history_data: List[Dict]) -> List[Dict]:
+        """
+        過去走に判定済みの属性を付与（calculate_total_score内で1回だけ実行）
+        
+        各スコア計算で個別に行っていたトラック種別・地方判定・グレード判定を
+        ここでまとめて行い、以降は付与済みの値を参照する。
+        各評価で共通に使う項目（競馬場・距離・上がり3F・着順）も取り出しておく。
+        'dist' は適性評価側の既定値（未取得なら0）で持つ。
+        元のレース辞書は 'race' キーでそのまま参照できる。
+        """
+        decorated = []
+        for idx in range(min(5, len(history_data))):  # 各評価が参照するのは最大5走まで
+            race = history_data[idx]
+            race_name = race.get('race_name', '')
+            course = race.get('course', '')
+            distance = race.get('dist', 2000)
+            
+            track_type = race.get('track_type', None)
+            if not track_type or track_type == '不明':
+                track_type = self._get_track_type_by_distance(distance, race_name, course)
+            grade, reliability = self.detect_race_grade(race_name)
+            
+            decorated.append({
+                'race': race,
+                'track_type': track_type,
+                'is_local': self._is_local_race(race_name, course),
+                'grade': grade,
+                'reliability': reliability,
+                'race_avg_3f_default': self._get_default_baseline_3f(distance, track_type),
+                'course': course,
+                'dist': race.get('dist', 0),
+                'last_3f': race.get('last_3f', 0.0),
+                'chakujun': race.get('chakujun', 99)
+            })
+        return decorated
+    
     def calculate_last_3f_relative_score(self, history_data: List[Dict], target_track_type: str = "芝", 
-                                        target_course: str = None, target_distance: int = None, 
-                                        target_baba: str = "良") -> float:
+                                        target_course: Optional[str] = None, target_distance: Optional[int] = None, 
+                                        target_baba: str = "良", decorated: Optional[List[Dict]] = None) -> float:
         """
         【改善版】上がり3F相対評価（重賞評価を緩和）
         
@@ -606,26 +695,27 @@ class EnhancedRaceScorer:
         """
         if not history_data:
             return 0.0
+        if decorated is None:
+            decorated = self._decorate(history_data)
         
         score = 0.0
         THRESHOLD = 2.0
         
-        for idx, race in enumerate(history_data[:3]):
-            my_last_3f = race.get('last_3f', 0.0)
+        for idx in range(min(3, len(decorated))):
+            row = decorated[idx]
+            race = row['race']
+            my_last_3f = row['last_3f']
             if my_last_3f <= 0:
                 continue
             
-            race_name = race.get('race_name', '')
             course = race.get('course', '')
             distance = race.get('dist', 2000)
             baba = race.get('baba', '良')
             distance_text = race.get('distance_text', '')
             
-            race_track_type = race.get('track_type', None)
-            if not race_track_type or race_track_type == '不明':
-                race_track_type = self._get_track_type_by_distance(distance, race_name, course)
+            race_track_type = row['track_type']
             track_type_mismatch = (race_track_type != target_track_type)
-            is_local = self._is_local_race(race_name, course)
+            is_local = row['is_local']
             
             # 2.0秒圏内の馬の平均上がり3Fを計算
             all_horses_results = race.get('all_horses_results', [])
@@ -637,87 +727,53 @@ class EnhancedRaceScorer:
                     if race_track_type == '芝' and course in self.central_courses:
                         race_avg_3f = self.course_analyzer.get_baseline_3f(course, distance, distance_text, baba)
                     else:
-                        race_avg_3f = self._get_default_baseline_3f(distance, race_track_type)
+                        race_avg_3f = row['race_avg_3f_default']
                         if is_local:
                             race_avg_3f += 1.0 if race_track_type == 'ダート' else 0.5
                 
                 comparison_type = "レース基準値"
             else:
+                # 圏内馬と全体平均用の上がりを1回の走査で集める
                 nearby_horses_3f = []
+                valid_3f = []
                 for horse_result in all_horses_results:
                     horse_3f = horse_result.get('last_3f', 0.0)
                     goal_diff = horse_result.get('goal_time_diff', 99)
                     
-                    if abs(goal_diff) <= THRESHOLD and horse_3f > 0:
-                        nearby_horses_3f.append(horse_3f)
+                    if horse_3f > 0:
+                        valid_3f.append(horse_3f)
+                        if abs(goal_diff) <= THRESHOLD:
+                            nearby_horses_3f.append(horse_3f)
                 
                 if nearby_horses_3f:
                     race_avg_3f = sum(nearby_horses_3f) / len(nearby_horses_3f)
                     comparison_type = f"{THRESHOLD}秒圏内{len(nearby_horses_3f)}頭平均"
                 else:
-                    valid_3f = [h['last_3f'] for h in all_horses_results if h.get('last_3f', 0) > 0]
-                    race_avg_3f = sum(valid_3f) / len(valid_3f) if valid_3f else self._get_default_baseline_3f(distance, race_track_type)
+                    race_avg_3f = sum(valid_3f) / len(valid_3f) if valid_3f else row['race_avg_3f_default']
                     comparison_type = "レース全体平均（圏内なし）"
             
-            chakujun = race.get('chakujun', 99)
+            chakujun = row['chakujun']
             speed_diff = race_avg_3f - my_last_3f
             
             # 短距離は1.3秒以内の基準で評価（修正: 値を下げる）
-            if distance <= 1400:
-                if speed_diff >= 1.3:
-                    base_points = 15.0  # 25.0 → 15.0
-                elif speed_diff >= 0.8:
-                    base_points = 12.0  # 20.0 → 12.0
-                elif speed_diff >= 0.4:
-                    base_points = 8.0   # 15.0 → 8.0
-                elif speed_diff >= 0.0:
-                    base_points = 5.0   # 10.0 → 5.0
-                else:
-                    base_points = -3.0  # -5.0 → -3.0
-            else:
-                if speed_diff >= 1.5:
-                    base_points = 15.0  # 25.0 → 15.0
-                elif speed_diff >= 1.0:
-                    base_points = 12.0  # 20.0 → 12.0
-                elif speed_diff >= 0.5:
-                    base_points = 8.0   # 15.0 → 8.0
-                elif speed_diff >= 0.0:
-                    base_points = 5.0   # 10.0 → 5.0
-                else:
-                    base_points = -3.0  # -5.0 → -3.0
+            thresholds = self.LAST_3F_SHORT_THRESHOLDS if distance <= 1400 else self.LAST_3F_LONG_THRESHOLDS
+            base_points = self.LAST_3F_BASE_POINTS[bisect_right(thresholds, speed_diff)]
             
             # 【改善】重賞レースでの着順評価を緩和
-            grade, base_reliability = self.detect_race_grade(race_name)
+            grade, base_reliability = row['grade'], row['reliability']
             
-            if grade in ['G1', 'G2', 'G3']:
-                # 重賞なら2-5着でも一定の評価
-                if chakujun == 1:
-                    finish_bonus = 3.0
-                elif chakujun in [2, 3]:
-                    finish_bonus = 2.0  # 従来1.0-2.0 → 2.0に統一
-                elif chakujun in [4, 5]:
-                    finish_bonus = 1.5  # 新設
-                else:
-                    finish_bonus = 0.0
-            else:
-                # 通常のレース
-                if chakujun == 1:
-                    finish_bonus = 3.0
-                elif chakujun == 2:
-                    finish_bonus = 2.0
-                elif chakujun == 3:
-                    finish_bonus = 1.0
-                else:
-                    finish_bonus = 0.0
+            finish_table = self.LAST_3F_FINISH_BONUS_GRADED if grade in ['G1', 'G2', 'G3'] else self.LAST_3F_FINISH_BONUS
+            finish_bonus = finish_table.get(chakujun, 0.0)
             
             # 【修正】ポイント計算を適正化（乗算→加算）
-            if speed_diff > 0 and finish_bonus > 0:
-                # 上がりが速く、好着順の場合
-                points = base_points + (finish_bonus * 5.0)  # 修正: 乗算→加算
-            elif speed_diff > 0:
-                # 上がりは速いが着順が悪い
-                points = base_points * 0.5  # 修正: 係数を下げる
-            elif speed_diff <= 0 and finish_bonus > 0:
+            if speed_diff > 0:
+                if finish_bonus > 0:
+                    # 上がりが速く、好着順の場合
+                    points = base_points + (finish_bonus * 5.0)  # 修正: 乗算→加算
+                else:
+                    # 上がりは速いが着順が悪い
+                    points = base_points * 0.5  # 修正: 係数を下げる
+            elif finish_bonus > 0:
                 # 上がりは遅いが着順は良い
                 points = finish_bonus * 3.0  # 修正: 係数を下げる
             else:
@@ -725,7 +781,7 @@ class EnhancedRaceScorer:
                 points = -3.0  # 修正: ペナルティを緩和
             
             reliability = base_reliability * (0.4 if is_local else 1.0) * (0.3 if track_type_mismatch else 1.0)
-            time_decay = 1.0 - (idx * 0.15)
+            time_decay = self.RECENT_TIME_DECAY[idx]
             score += points * reliability * time_decay
             
             if self.debug_mode:
@@ -742,40 +798,63 @@ class EnhancedRaceScorer:
     
     def calculate_total_score(self, current_weight: float, target_course: str, target_distance: int,
                             history_data: List[Dict], target_track_type: str = "芝",
-                            running_style_info: Dict = None, race_pace_prediction: Dict = None,
-                            target_baba: str = "良") -> Dict:
-        """総合スコアを計算"""
-        
-        # 1. 上がり3F相対評価
-        last_3f_score = self.calculate_last_3f_relative_score(
-            history_data, target_track_type, target_course, target_distance, target_baba
-        )
-        
-        # 2. 距離適性スコア
-        distance_score = self._calculate_distance_score(history_data, target_distance)
-        
-        # 3. コース適性スコア
-        course_score = self._calculate_course_score(history_data, target_course)
-        
-        # 4. 斤量評価（全距離で適用）
-        # 短距離: weight_time_score（高斤量×速いタイムを評価）
-        # 全距離: weight_penalty（斤量増加のペナルティ）
-        if target_distance <= 1600:
-            weight_time_score = self._calculate_weight_time_score(current_weight, history_data, target_distance, target_track_type)
-        else:
-            weight_time_score = 0.0
+                            running_style_info: Optional[Dict] = None, race_pace_prediction: Optional[Dict] = None,
+                            target_baba: str = "良", min_score_cutoff: Optional[float] = None) -> Dict:
+        """
+        総合スコアを計算
         
-        # 斤量増ペナルティは全距離で適用
-        weight_penalty = self._calculate_weight_penalty(history_data, current_weight, target_distance)
+        Args:
+            min_score_cutoff: 指定した場合、地方→JRA転入の危険フラグが立った馬のうち
+                              上がり3F・後半4F・斤量×タイム評価が満点でもこの値に届かない馬は
+                              それらの評価を省略し、total_scoreをCUTOFF_TOTAL_SCOREとして返す
+                              （上位候補だけが必要な一括予測向け。省略した評価は0点、'cutoff': True を付与）
+        """
+        # 過去走の判定（トラック種別・地方・グレード）を1回だけ行う
+        decorated = self._decorate(history_data) if history_data else []
         
-        # 5. 【新】後半4F評価（芝中長距離のみ）
-        late_4f_score = self._calculate_late_4f_score(history_data, target_distance, target_track_type)
+        # 危険フラグは先に判定（足切りの判定に使う）
+        danger_flags = self._check_danger_flags(decorated, target_course, target_track_type)
         
-        # 6. 【新】長期休養ペナルティ
-        layoff_penalty = self._calculate_layoff_penalty(history_data)
+        # 距離別にウェイトを調整
+        is_long_distance = target_distance >= 1800 and target_track_type == "芝"
+        if is_long_distance:
+            # 芝中長距離（1800m以上）: 後半4F評価を重視
+            weight_3f = 0.30
+            weight_late_4f = 0.20
+            weight_weight_time = 0.0
+            weight_distance = 0.15
+            weight_course = 0.10
+            weight_style = 0.15
+            weight_penalty_factor = 0.10
+        else:
+            # 短距離（1600m以下）: weight_time_scoreを使用
+            weight_3f = 0.30
+            weight_late_4f = 0.0
+            weight_weight_time = 0.30 if target_distance <= 1600 else 0.0  # 【新】斤量×タイム評価（1600m以下のみ）
+            weight_distance = 0.15
+            weight_course = 0.10
+            weight_style = 0.15
+            weight_penalty_factor = 0.0
         
-        # 7. 【新】重賞出走ボーナス
-        grade_race_bonus = self._calculate_grade_race_bonus(history_data)
+        if history_data:
+            # 2. 距離適性スコア
+            distance_score = self._calculate_distance_score(decorated, target_distance)
+            
+            # 3. コース適性スコア
+            course_score = self._calculate_course_score(decorated, target_course)
+            
+            # 4. 斤量増ペナルティは全距離で適用
+            weight_penalty = self._calculate_weight_penalty(history_data, current_weight, target_distance)
+            
+            # 6. 【新】長期休養ペナルティ
+            layoff_penalty = self._calculate_layoff_penalty(history_data)
+            
+            # 7. 【新】重賞出走ボーナス
+            grade_race_bonus = self._calculate_grade_race_bonus(decorated)
+        else:
+            # 過去走なし（新馬・データなし）: 過去走ベースの評価はすべて0点
+            distance_score = course_score = weight_penalty = 0.0
+            layoff_penalty = grade_race_bonus = 0.0
         
         # 8. 【改善】脚質ボーナス（コース×距離別ウェイト使用）
         style_bonus = 0.0
@@ -795,30 +874,59 @@ class EnhancedRaceScorer:
                 logger.debug(f"  脚質ボーナス: {style}×{pace}×{target_course}{target_distance}m")
                 logger.debug(f"    生ボーナス{raw_bonus:+.1f} × 信頼度{confidence:.2f} × ウェイト{style_weight:.2f} = {style_bonus:+.2f}")
         
-        # 8. 危険フラグ
-        danger_flags = self._check_danger_flags(history_data, target_course, target_track_type)
-        
         # 9. 危険フラグペナルティ
         danger_penalty = 0.0
         if danger_flags['local_to_jra']:
             danger_penalty -= 15.0
         
         # 【修正】各スコアを正規化してウェイトを適用
-        # 距離別にウェイトを調整
-        is_long_distance = target_distance >= 1800 and target_track_type == "芝"
-        
-        # 上がり3Fスコアを0-100点に正規化（最大150点想定）
-        normalized_3f = min(last_3f_score / 150.0 * 100, 100)
-        
-        # 距離適性を0-100点に正規化（最大15点想定）
-        normalized_distance = min(distance_score / 15.0 * 100, 100)
+        # 距離適性を0-100点に正規化（直近3走×最大5点=15点が上限のためクリップ不要）
+        normalized_distance = distance_score / 15.0 * 100
         
-        # コース適性を0-100点に正規化（最大15点想定）
-        normalized_course = min(course_score / 15.0 * 100, 100)
+        # コース適性を0-100点に正規化（直近3走×最大5点=15点が上限のためクリップ不要）
+        normalized_course = course_score / 15.0 * 100
         
         # 脚質ボーナスを0-100点に正規化（最大20点想定）
         normalized_style = min(style_bonus / 20.0 * 100, 100)
         
+        # 足切り: 地方→JRA転入馬は上がり3F・後半4F・斤量×タイム評価が満点（正規化100点）でも
+        # min_score_cutoff に届かなければ、それらの評価を省略する
+        cutoff = False
+        if min_score_cutoff is not None and danger_flags['local_to_jra']:
+            best_total = (
+                100 * weight_3f +
+                100 * weight_late_4f +
+                100 * weight_weight_time +
+                normalized_distance * weight_distance +
+                normalized_course * weight_course +
+                normalized_style * weight_style +
+                weight_penalty + layoff_penalty + grade_race_bonus + danger_penalty
+            )
+            cutoff = best_total < min_score_cutoff
+            if cutoff and self.debug_mode:
+                logger.debug(f"  足切り: 最大{best_total:.1f}点 < {min_score_cutoff:.1f}点")
+        
+        if history_data and not cutoff:
+            # 1. 上がり3F相対評価
+            last_3f_score = self.calculate_last_3f_relative_score(
+                history_data, target_track_type, target_course, target_distance, target_baba, decorated
+            )
+            
+            # 4. 斤量評価
+            # 短距離: weight_time_score（高斤量×速いタイムを評価）
+            if target_distance <= 1600:
+                weight_time_score = self._calculate_weight_time_score(current_weight, decorated, target_distance, target_track_type)
+            else:
+                weight_time_score = 0.0
+            
+            # 5. 【新】後半4F評価（芝中長距離のみ）
+            late_4f_score = self._calculate_late_4f_score(decorated, target_distance, target_track_type)
+        else:
+            last_3f_score = weight_time_score = late_4f_score = 0.0
+        
+        # 上がり3Fスコアを0-100点に正規化（最大150点想定）
+        normalized_3f = min(last_3f_score / 150.0 * 100, 100)
+        
         # 後半4Fスコアを0-100点に正規化（最大50点想定）
         normalized_late_4f = min(late_4f_score / 50.0 * 100, 100) if late_4f_score != 0 else 0
         
@@ -827,14 +935,6 @@ class EnhancedRaceScorer:
         
         # ウェイトを適用して総合スコア計算
         if is_long_distance:
-            # 芝中長距離（1800m以上）: 後半4F評価を重視
-            weight_3f = 0.30
-            weight_late_4f = 0.20
-            weight_distance = 0.15
-            weight_course = 0.10
-            weight_style = 0.15
-            weight_penalty_factor = 0.10
-            
             total = (
                 normalized_3f * weight_3f +
                 normalized_late_4f * weight_late_4f +
@@ -847,15 +947,6 @@ class EnhancedRaceScorer:
                 danger_penalty    # 危険フラグペナルティ
             )
         else:
-            # 短距離（1600m以下）: weight_time_scoreを使用
-            weight_3f = 0.30
-            weight_late_4f = 0.0
-            weight_weight_time = 0.30  # 【新】斤量×タイム評価
-            weight_distance = 0.15
-            weight_course = 0.10
-            weight_style = 0.15
-            weight_penalty_factor = 0.0
-            
             total = (
                 normalized_3f * weight_3f +
                 normalized_weight_time * weight_weight_time +  # 【新】
@@ -888,7 +979,7 @@ class EnhancedRaceScorer:
             'weights': {
                 'last_3f': weight_3f,
                 'late_4f': weight_late_4f,
-                'weight_time': weight_weight_time if target_distance <= 1600 else 0.0,
+                'weight_time': weight_weight_time,
                 'distance': weight_distance,
                 'course': weight_course,
                 'running_style': weight_style,
@@ -896,6 +987,15 @@ class EnhancedRaceScorer:
             }
         }
         
+        if cutoff:
+            return {
+                'total_score': self.CUTOFF_TOTAL_SCORE,
+                'is_dangerous': danger_flags['is_dangerous'],
+                'danger_flags': danger_flags,
+                'breakdown': breakdown,
+                'cutoff': True
+            }
+        
         return {
             'total_score': round(total, 1),
             'is_dangerous': danger_flags['is_dangerous'],
@@ -903,37 +1003,83 @@ class EnhancedRaceScorer:
             'breakdown': breakdown
         }
     
-    def _calculate_distance_score(self, history_data: List[Dict], target_distance: int) -> float:
+    def calculate_card_scores(self, card: List[Dict], target_course: str, target_distance: int,
+                              target_track_type: str = "芝", race_pace_prediction: Optional[Dict] = None,
+                              target_baba: str = "良", min_score_cutoff: Optional[float] = None) -> List[Dict]:
+        """
+        出馬表（全頭）をまとめてスコアリング
+        
+        レース単位で共通の条件（コース・距離・トラック・馬場・展開予測）は
+        1回だけ渡し、各馬の過去走だけを順に評価する。
+        展開予測が未指定の場合は出走馬の脚質から1回だけ予測する。
+        
+        Args:
+            card: 各馬の {'current_weight', 'history_data', 'running_style_info'(任意)} のリスト
+            min_score_cutoff: calculate_total_scoreへそのまま渡す（届かない危険馬の詳細評価を省略）
+        
+        Returns:
+            cardと同じ順序のcalculate_total_scoreの結果リスト
+        """
+        if race_pace_prediction is None:
+            styles = [entry['running_style_info'] for entry in card if entry.get('running_style_info')]
+            race_pace_prediction = self.style_analyzer.predict_race_pace(styles, len(card), target_course)
+        
+        return [
+            self.calculate_total_score(
+                entry['current_weight'], target_course, target_distance,
+                entry.get('history_data') or [], target_track_type,
+                entry.get('running_style_info'), race_pace_prediction, target_baba, min_score_cutoff
+            )
+            for entry in card
+        ]
+    
+    # 距離適性: 距離差の上限（以内）ごとの (3着以内, 4着以下) ボーナス
+    DISTANCE_FIT_LIMITS = (200, 400)
+    DISTANCE_FIT_BONUS = ((5.0, 2.0), (3.0, 1.0))
+    
+    def _calculate_distance_score(self, decorated: List[Dict], target_distance: int) -> float:
         """距離適性スコア"""
         score = 0.0
-        for race in history_data[:3]:
-            dist_diff = abs(race.get('dist', 0) - target_distance)
-            chakujun = race.get('chakujun', 99)
-            
-            if dist_diff <= 200:
-                bonus = 5.0 if chakujun <= 3 else 2.0
-            elif dist_diff <= 400:
-                bonus = 3.0 if chakujun <= 3 else 1.0
-            else:
-                bonus = 0.0
+        for idx in range(min(3, len(decorated))):
+            row = decorated[idx]
+            dist_diff = abs(row['dist'] - target_distance)
             
-            score += bonus
+            # 距離差の区分ごとの (3着以内, 4着以下) ボーナス（400m超は0点）
+            bucket = bisect_left(self.DISTANCE_FIT_LIMITS, dist_diff)
+            if bucket < len(self.DISTANCE_FIT_BONUS):
+                top3_bonus, other_bonus = self.DISTANCE_FIT_BONUS[bucket]
+                score += top3_bonus if row['chakujun'] <= 3 else other_bonus
         
         return round(score, 1)
     
-    def _calculate_course_score(self, history_data: List[Dict], target_course: str) -> float:
+    def _calculate_course_score(self, decorated: List[Dict], target_course: str) -> float:
         """コース適性スコア"""
         score = 0.0
-        for race in history_data[:3]:
-            course = race.get('course', '')
-            chakujun = race.get('chakujun', 99)
+        for idx in range(min(3, len(decorated))):
+            row = decorated[idx]
             
-            if course == target_course:
-                bonus = 5.0 if chakujun <= 3 else 2.0
+            if row['course'] == target_course:
+                bonus = 5.0 if row['chakujun'] <= 3 else 2.0
                 score += bonus
         
         return round(score, 1)
     
+    # 休養期間の基準日（2026年2月11日）
+    LAYOFF_REFERENCE_DATE = datetime(2026, 2, 11)
+    # 長期休養ペナルティ: 経過日数の閾値（以上）ごとのペナルティ
+    # 4・5・6・7・8・9・10・11ヶ月以上（30日換算）、1年以上は一律-20点
+    LAYOFF_DAY_THRESHOLDS = (120, 150, 180, 210, 240, 270, 300, 330, 365)
+    LAYOFF_PENALTIES = (0.0, -4.0, -6.0, -8.0, -10.0, -11.0, -12.0, -14.0, -16.0, -20.0)
+    
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _parse_race_date(date_str: str) -> datetime:
+        """レース日付を解析（同じ日付文字列は再解析しない）
+        
+        "2024/01/15", "2024-01-15", "2024.01.15" 形式に対応
+        """
+        return datetime.strptime(date_str.replace('.', '/').replace('-', '/'), '%Y/%m/%d')
+    
     def _calculate_layoff_penalty(self, history_data: List[Dict]) -> float:
         """長期休養明けペナルティ
         
@@ -953,47 +1099,33 @@ class EnhancedRaceScorer:
             return 0.0
         
         # 日付の解析（複数フォーマット対応）
-        from datetime import datetime, timedelta
         try:
             if isinstance(race_date, str):
-                # "2024/01/15", "2024-01-15", "2024.01.15" 形式に対応
-                race_date = race_date.replace('.', '/').replace('-', '/')
-                race_datetime = datetime.strptime(race_date, '%Y/%m/%d')
+                race_datetime = self._parse_race_date(race_date)
             else:
                 return 0.0
             
-            # 現在日時（2026年2月11日を基準）
-            current_date = datetime(2026, 2, 11)
-            days_since_last_race = (current_date - race_datetime).days
+            days_since_last_race = (self.LAYOFF_REFERENCE_DATE - race_datetime).days
             
-            # 日数に応じたペナルティ（細分化版）
-            if days_since_last_race >= 365:  # 1年以上は一律
-                penalty = -20.0
-            elif days_since_last_race >= 330:  # 11ヶ月以上（330日）
-                penalty = -16.0
-            elif days_since_last_race >= 300:  # 10ヶ月以上（300日）
-                penalty = -14.0
-            elif days_since_last_race >= 270:  # 9ヶ月以上（270日）
-                penalty = -12.0
-            elif days_since_last_race >= 240:  # 8ヶ月以上（240日）
-                penalty = -11.0
-            elif days_since_last_race >= 210:  # 7ヶ月以上（210日）
-                penalty = -10.0
-            elif days_since_last_race >= 180:  # 6ヶ月以上（180日）
-                penalty = -8.0
-            elif days_since_last_race >= 150:  # 5ヶ月以上（150日）
-                penalty = -6.0
-            elif days_since_last_race >= 120:  # 4ヶ月以上（120日）
-                penalty = -4.0
-            else:  # 4ヶ月未満（3ヶ月以下）はペナルティなし
-                penalty = 0.0
+            # 日数に応じたペナルティ（細分化版・4ヶ月未満はペナルティなし）
+            penalty = self.LAYOFF_PENALTIES[bisect_right(self.LAYOFF_DAY_THRESHOLDS, days_since_last_race)]
             
             return penalty
             
         except (ValueError, AttributeError):
             return 0.0
     
-    def _calculate_grade_race_bonus(self, history_data: List[Dict]) -> float:
+    # 重賞出走ボーナス: (グレード, 着順) → ボーナス、着順が該当しなければ GRADE_BONUS_DEFAULT
+    GRADE_BONUS_TABLE = {
+        ('G1', 1): 10.0, ('G1', 2): 8.0, ('G1', 3): 8.0, ('G1', 4): 6.0, ('G1', 5): 6.0,
+        ('G2', 1): 7.0, ('G2', 2): 5.0, ('G2', 3): 5.0, ('G2', 4): 4.0, ('G2', 5): 4.0,
+        ('G3', 1): 5.0, ('G3', 2): 3.0, ('G3', 3): 3.0, ('G3', 4): 2.5, ('G3', 5): 2.5,
+    }
+    GRADE_BONUS_DEFAULT = {'G1': 5.0, 'G2': 3.0, 'G3': 2.0}  # 出走しただけでも評価
+    # 直近からの経過走数による減衰（1.0 - idx * 0.10）
+    GRADE_TIME_DECAY = tuple(1.0 - (idx * 0.10) for idx in range(5))
+    
+    def _calculate_grade_race_bonus(self, decorated: List[Dict]) -> float:
         """重賞出走ボーナス
         
         過去のレース出走歴に基づいてボーナスを付与
@@ -1002,87 +1134,56 @@ class EnhancedRaceScorer:
         - G3出走: +5点（1着）、+3点（2-3着）、+2点（4着以下）
         - 最大5走まで評価（時間減衰あり）
         """
-        if not history_data:
+        if not decorated:
             return 0.0
         
         bonus = 0.0
         
-        for idx, race in enumerate(history_data[:5]):  # 過去5走まで見る
-            race_name = race.get('race_name', '')
-            chakujun = race.get('chakujun', 99)
-            grade, _ = self.detect_race_grade(race_name)
+        for idx in range(min(5, len(decorated))):  # 過去5走まで見る
+            row = decorated[idx]
+            grade = row['grade']
             
             # 重賞のみ評価
-            if grade not in ['G1', 'G2', 'G3']:
+            default_bonus = self.GRADE_BONUS_DEFAULT.get(grade)
+            if default_bonus is None:
                 continue
             
             # グレード別のボーナス
-            if grade == 'G1':
-                if chakujun == 1:
-                    race_bonus = 10.0
-                elif chakujun in [2, 3]:
-                    race_bonus = 8.0
-                elif chakujun in [4, 5]:
-                    race_bonus = 6.0
-                else:
-                    race_bonus = 5.0  # 出走しただけでも評価
-            elif grade == 'G2':
-                if chakujun == 1:
-                    race_bonus = 7.0
-                elif chakujun in [2, 3]:
-                    race_bonus = 5.0
-                elif chakujun in [4, 5]:
-                    race_bonus = 4.0
-                else:
-                    race_bonus = 3.0
-            else:  # G3
-                if chakujun == 1:
-                    race_bonus = 5.0
-                elif chakujun in [2, 3]:
-                    race_bonus = 3.0
-                elif chakujun in [4, 5]:
-                    race_bonus = 2.5
-                else:
-                    race_bonus = 2.0
+            chakujun = row['chakujun']
+            race_bonus = self.GRADE_BONUS_TABLE.get((grade, chakujun), default_bonus)
             
             # 時間減衰（新しい方が重視）
-            time_decay = 1.0 - (idx * 0.10)
+            time_decay = self.GRADE_TIME_DECAY[idx]
             bonus += race_bonus * time_decay
             
             if self.debug_mode:
-                logger.debug(f"  重賞出走ボーナス: {race_name} {grade} {chakujun}着 → +{race_bonus * time_decay:.1f}点")
+                logger.debug(f"  重賞出走ボーナス: {row['race'].get('race_name', '')} {grade} {chakujun}着 → +{race_bonus * time_decay:.1f}点")
         
         return round(bonus, 1)
     
-    def _calculate_late_4f_score(self, history_data: List[Dict], target_distance: int, 
+    def _calculate_late_4f_score(self, decorated: List[Dict], target_distance: int, 
                                   target_track_type: str) -> float:
         """後半4F評価（芝中長距離専用）"""
         if target_track_type != "芝" or target_distance < 1800:
             return 0.0
         
         # 距離別の後半4F基準値
-        BASELINE_4F = 47.2 if target_distance <= 2000 else 47.8 if target_distance <= 2400 else 48.3
+        BASELINE_4F = self.LATE_4F_BASELINES[bisect_left(self.LATE_4F_BASELINE_DISTANCES, target_distance)]
         score = 0.0
         
-        for idx, race in enumerate(history_data[:3]):
-            distance = race.get('dist', 0)
-            race_name = race.get('race_name', '')
-            course = race.get('course', '')
-            
-            # トラックタイプを取得
-            race_track_type = race.get('track_type', None)
-            if not race_track_type or race_track_type == '不明':
-                race_track_type = self._get_track_type_by_distance(distance, race_name, course)
+        for idx in range(min(3, len(decorated))):
+            row = decorated[idx]
+            distance = row['dist']
             
             # 芝中長距離レースのみ評価
-            if race_track_type != '芝' or distance < 1800:
+            if distance < 1800 or row['track_type'] != '芝':
                 continue
             
             # 地方競馬は評価対象外
-            if self._is_local_race(race_name, course):
+            if row['is_local']:
                 continue
             
-            last_3f = race.get('last_3f', 0.0)
+            last_3f = row['last_3f']
             if last_3f <= 0:
                 continue
             
@@ -1091,66 +1192,38 @@ class EnhancedRaceScorer:
             diff_from_baseline = BASELINE_4F - estimated_late_4f
             
             # 差分に応じた倍率適用
-            if diff_from_baseline >= 3.5:
-                multiplier = 1.80
-            elif diff_from_baseline >= 2.5:
-                multiplier = 1.50
-            elif diff_from_baseline >= 1.5:
-                multiplier = 1.30
-            elif diff_from_baseline >= 0.7:
-                multiplier = 1.15
-            elif diff_from_baseline >= -0.5:
-                multiplier = 1.00
-            elif diff_from_baseline >= -2.0:
-                multiplier = 0.85
-            else:
-                multiplier = 0.65
+            multiplier = self.LATE_4F_MULTIPLIERS[bisect_right(self.LATE_4F_DIFF_THRESHOLDS, diff_from_baseline)]
             
             points = diff_from_baseline * 10.0 * multiplier
             
             # レース格による信頼度
-            grade, _ = self.detect_race_grade(race_name)
-            reliability_map = {
-                'G1': 1.0, 'G2': 0.95, 'G3': 0.9,
-                'JpnI': 1.0, 'JpnII': 0.95, 'JpnIII': 0.9,
-                'OP': 0.85
-            }
-            reliability = reliability_map.get(grade, 0.7)
+            reliability = self.LATE_4F_RELIABILITY.get(row['grade'], 0.7)
             
             # 時間減衰
-            time_decay = 1.0 - (idx * 0.15)
+            time_decay = self.RECENT_TIME_DECAY[idx]
             
             # 着順ボーナス
-            chakujun = race.get('chakujun', 99)
-            if chakujun == 1:
-                finish_bonus = 1.0
-            elif chakujun <= 3:
-                finish_bonus = 0.9
-            elif chakujun <= 5:
-                finish_bonus = 0.75
-            elif chakujun <= 10:
-                finish_bonus = 0.5
-            else:
-                finish_bonus = 0.3
+            chakujun = row['chakujun']
+            finish_bonus = 1.0 if chakujun == 1 else self.LATE_4F_FINISH_BONUS[bisect_left(self.FINISH_RANK_LIMITS, chakujun)]
             
             score += points * reliability * time_decay * finish_bonus
         
         return round(score, 1)
     
-    def _calculate_weight_time_score(self, current_weight: float, history_data: List[Dict], 
+    def _calculate_weight_time_score(self, current_weight: float, decorated: List[Dict], 
                                      target_distance: int, target_track_type: str = "芝") -> float:
         """斤量-タイム評価（短距離1600m以下専用）"""
-        if not history_data:
+        # 1600m超の対象レースでは呼び出し側も使わないため計算しない
+        if not decorated or target_distance > 1600:
             return 0.0
         
         score = 0.0
         
-        for idx, race in enumerate(history_data[:3]):
-            distance = race.get('dist', 0)
-            weight = race.get('weight', 0.0)
-            last_3f = race.get('last_3f', 0.0)
-            race_name = race.get('race_name', '')
-            course = race.get('course', '')
+        for idx in range(min(3, len(decorated))):
+            row = decorated[idx]
+            distance = row['dist']
+            weight = row['race'].get('weight', 0.0)
+            last_3f = row['last_3f']
             
             # 短距離（1000-1600m）のみ評価
             if distance > 1600 or distance < 1000:
@@ -1158,21 +1231,12 @@ class EnhancedRaceScorer:
             if weight <= 0 or last_3f <= 0:
                 continue
             
-            # トラックタイプを取得
-            race_track_type = race.get('track_type', None)
-            if not race_track_type or race_track_type == '不明':
-                race_track_type = self._get_track_type_by_distance(distance, race_name, course)
-            
-            is_local = self._is_local_race(race_name, course)
-            time_decay = 1.0 - (idx * 0.25)
+            race_track_type = row['track_type']
+            is_local = row['is_local']
+            time_decay = self.WEIGHT_TIME_DECAY[idx]
             
             # 距離別の基準値設定
-            if distance <= 1200:
-                BASE_3F, WEIGHT_THRESHOLD = 34.0, 56.0
-            elif distance <= 1400:
-                BASE_3F, WEIGHT_THRESHOLD = 34.3, 55.5
-            else:  # 1401～1600m
-                BASE_3F, WEIGHT_THRESHOLD = 34.5, 55.0
+            BASE_3F, WEIGHT_THRESHOLD = self.WEIGHT_TIME_BASELINES[bisect_left(self.WEIGHT_TIME_DISTANCES, distance)]
             
             # 地方戦の基準値調整
             if is_local:
@@ -1197,16 +1261,7 @@ class EnhancedRaceScorer:
             adjusted_base = BASE_3F + (0.3 if weight >= 57.0 else 0.1 if weight >= 55.0 else 0)
             diff = adjusted_base - last_3f
             
-            if diff >= 1.0:
-                speed_bonus = 6.0
-            elif diff >= 0.5:
-                speed_bonus = 4.0
-            elif diff >= 0.0:
-                speed_bonus = 2.0
-            elif diff >= -0.5:
-                speed_bonus = 0.0
-            else:
-                speed_bonus = -3.0
+            speed_bonus = self.WEIGHT_TIME_SPEED_BONUS[bisect_right(self.WEIGHT_TIME_SPEED_THRESHOLDS, diff)]
             
             if is_local:
                 speed_bonus *= 0.6
@@ -1227,17 +1282,8 @@ class EnhancedRaceScorer:
             race_score = (weight_bonus + speed_bonus + combo_bonus) * time_decay
             
             # 着順による調整
-            chakujun = race.get('chakujun', 99)
-            if chakujun == 1:
-                race_score *= 1.2
-            elif chakujun <= 3:
-                race_score *= 1.0
-            elif chakujun <= 5:
-                race_score *= 0.85
-            elif chakujun <= 10:
-                race_score *= 0.6
-            else:
-                race_score *= 0.3
+            chakujun = row['chakujun']
+            race_score *= 1.2 if chakujun == 1 else self.WEIGHT_TIME_FINISH_FACTORS[bisect_left(self.FINISH_RANK_LIMITS, chakujun)]
             
             # トラックタイプ不一致ペナルティ
             if race_track_type != target_track_type:
@@ -1256,12 +1302,16 @@ class EnhancedRaceScorer:
         if not history_data:
             return 0.0
         
-        # 前走の斤量を取得
-        prev_weight = history_data[0].get('weight', current_weight)
-        
-        # 過去3走の平均斤量も計算
-        recent_weights = [r.get('weight', current_weight) for r in history_data[:3]]
-        avg_weight = sum(recent_weights) / len(recent_weights)
+        # 前走の斤量と過去3走の平均斤量を1回の走査で計算
+        n = min(3, len(history_data))
+        prev_weight = current_weight
+        weight_sum = 0.0
+        for idx in range(n):
+            weight = history_data[idx].get('weight', current_weight)
+            if idx == 0:
+                prev_weight = weight
+            weight_sum += weight
+        avg_weight = weight_sum / n
         
         # 前走との差分と平均との差分の大きい方を使用
         prev_diff = current_weight - prev_weight
@@ -1272,45 +1322,33 @@ class EnhancedRaceScorer:
         if weight_diff <= 0:
             return 0.0
         
-        # 距離別のペナルティレート
-        if target_distance >= 2000:
-            penalty_rate = -3.0  # 長距離は厳しく
-        elif target_distance >= 1800:
-            penalty_rate = -2.5
-        elif target_distance >= 1400:
-            penalty_rate = -2.0
-        else:
-            penalty_rate = -1.5  # 短距離は軽め
+        # 距離別のペナルティレート（短距離は軽め、長距離は厳しく）
+        penalty_rate = self.WEIGHT_PENALTY_RATES[bisect_right(self.WEIGHT_PENALTY_DISTANCES, target_distance)]
         
         return round(weight_diff * penalty_rate, 1)
     
-    def _check_danger_flags(self, history_data: List[Dict], target_course: str, 
+    def _check_danger_flags(self, decorated: List[Dict], target_course: str, 
                            target_track_type: str) -> Dict:
         """危険フラグをチェック"""
-        flags = {
-            'is_dangerous': False,
-            'local_to_jra': False,
-            'track_switch_dart_to_turf': False,
-            'reasons': []
-        }
+        flags = dict(self.DANGER_FLAGS_TEMPLATE, reasons=[])
         
-        if not history_data:
+        if not decorated:
             return flags
         
         # 地方→JRA転換
-        recent_local = sum(1 for r in history_data[:3] 
-                          if self._is_local_race(r.get('race_name', ''), r.get('course', '')))
+        recent_local = sum(1 for idx in range(min(3, len(decorated))) if decorated[idx]['is_local'])
         if recent_local >= 2 and target_course in self.central_courses:
             flags['local_to_jra'] = True
             flags['reasons'].append('地方馬のJRA復帰')
         
         # ダート→芝転換
-        recent_track = history_data[0].get('track_type', '')
+        latest_race = decorated[0]['race']
+        recent_track = latest_race.get('track_type', '')
         if not recent_track:
             recent_track = self._get_track_type_by_distance(
-                history_data[0].get('dist', 0),
-                history_data[0].get('race_name', ''),
-                history_data[0].get('course', '')
+                latest_race.get('dist', 0),
+                latest_race.get('race_name', ''),
+                latest_race.get('course', '')
             )
         
         if recent_track == 'ダート' and target_track_type == '芝':
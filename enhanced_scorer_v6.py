@@ -40,8 +40,9 @@ V5からの改善点:
 """
 
 import logging
+from bisect import bisect_left
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple
-from collections import Counter
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -115,6 +116,20 @@ class CourseAnalyzer:
         },
     }
     
+    # 基準値の距離一覧（近似距離検索用に事前ソート）
+    SORTED_BASELINE_DISTANCES = {course: sorted(d) for course, d in BASELINE_3F.items()}
+    
+    @staticmethod
+    def nearest_distance(distances: List[int], distance: int) -> int:
+        """ソート済み距離一覧から最も近い距離を返す（等距離なら短い方）"""
+        idx = bisect_left(distances, distance)
+        if idx == 0:
+            return distances[0]
+        if idx == len(distances):
+            return distances[-1]
+        lower, upper = distances[idx - 1], distances[idx]
+        return lower if distance - lower <= upper - distance else upper
+    
     @staticmethod
     def detect_track_variant(course: str, distance: int, distance_text: str = '') -> str:
         """内外回りを判定"""
@@ -160,11 +175,11 @@ class CourseAnalyzer:
         if distance in course_baselines:
             baseline = course_baselines[distance]
         else:
-            distances = sorted(course_baselines.keys())
+            distances = CourseAnalyzer.SORTED_BASELINE_DISTANCES.get(detailed_course, [])
             if not distances:
                 baseline = 34.5 if distance <= 1800 else 35.5 if distance <= 2200 else 36.5
             else:
-                closest = min(distances, key=lambda x: abs(x - distance))
+                closest = CourseAnalyzer.nearest_distance(distances, distance)
                 baseline = course_baselines[closest]
                 diff = distance - closest
                 baseline += diff * 0.001
@@ -256,6 +271,12 @@ class RunningStyleAnalyzer:
         },
     }
     
+    # ウェイト定義のある距離一覧（近似距離検索用に事前ソート）
+    SORTED_STYLE_WEIGHT_DISTANCES = {course: sorted(d) for course, d in COURSE_DISTANCE_STYLE_WEIGHTS.items()}
+    
+    # 前に行く脚質（ペース予測で数える対象）
+    FRONT_STYLES = frozenset(('逃げ', '先行'))
+    
     @staticmethod
     def classify_running_style(position_4c: int, field_size: int, last_3f: float, 
                                race_avg_3f: float = 0) -> Dict:
@@ -295,8 +316,7 @@ class RunningStyleAnalyzer:
         if not horses:
             return {'pace': 'ミドル', 'front_ratio': 0.30}
         
-        style_counts = Counter(h.get('style', '不明') for h in horses if h.get('style') != '不明')
-        front_runners = style_counts.get('逃げ', 0) + style_counts.get('先行', 0)
+        front_runners = sum(1 for h in horses if h.get('style') in RunningStyleAnalyzer.FRONT_STYLES)
         
         # コース特性を取得
         course_info = RunningStyleAnalyzer.COURSE_CHARACTERISTICS.get(course, {})
@@ -374,11 +394,11 @@ class RunningStyleAnalyzer:
             return course_weights[distance].get(style, 1.0)
         
         # 最も近い距離のウェイトを使用
-        distances = sorted(course_weights.keys())
+        distances = RunningStyleAnalyzer.SORTED_STYLE_WEIGHT_DISTANCES.get(course)
         if not distances:
             return 1.0
         
-        closest_distance = min(distances, key=lambda x: abs(x - distance))
+        closest_distance = CourseAnalyzer.nearest_distance(distances, distance)
         return course_weights[closest_distance].get(style, 1.0)
 
 
@@ -390,7 +410,10 @@ class RaceScorer:
         self.style_analyzer = RunningStyleAnalyzer()
         self.course_analyzer = CourseAnalyzer()
     
-    def detect_race_grade(self, race_name: str):
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def detect_race_grade(race_name: str):
+        """レースグレードを判定（同じレース名は再判定しない）"""
         if not race_name:
             return "不明", 0.60
 
@@ -761,6 +784,16 @@ class RaceScorer:
                 logger.debug(f"  日付解析エラー: {e}")
             return 0.0
     
+    # 重賞出走ボーナス: (グレード, 着順) → ボーナス、着順が該当しなければ GRADE_BONUS_DEFAULT
+    GRADE_BONUS_TABLE = {
+        ('G1', 1): 10.0, ('G1', 2): 8.0, ('G1', 3): 8.0,
+        ('G2', 1): 7.0, ('G2', 2): 5.0, ('G2', 3): 5.0,
+        ('G3', 1): 5.0, ('G3', 2): 3.0, ('G3', 3): 3.0,
+    }
+    GRADE_BONUS_DEFAULT = {'G1': 5.0, 'G2': 3.0, 'G3': 2.0}
+    # 直近からの経過走数による減衰（1.0 - idx * 0.15）
+    GRADE_TIME_DECAY = tuple(1.0 - (idx * 0.15) for idx in range(5))
+    
     def _calculate_grade_race_bonus(self, history_data: List[Dict]) -> float:
         """重賞出走ボーナス"""
         bonus = 0.0
@@ -771,35 +804,14 @@ class RaceScorer:
             
             grade, _ = self.detect_race_grade(race_name)
             
-            if grade not in ['G1', 'G2', 'G3']:
+            default_bonus = self.GRADE_BONUS_DEFAULT.get(grade)
+            if default_bonus is None:
                 continue
             
             # グレード別のボーナス
-            if grade == 'G1':
-                if chakujun == 1:
-                    race_bonus = 10.0
-                elif chakujun in [2, 3]:
-                    race_bonus = 8.0
-                else:
-                    race_bonus = 5.0
-            elif grade == 'G2':
-                if chakujun == 1:
-                    race_bonus = 7.0
-                elif chakujun in [2, 3]:
-                    race_bonus = 5.0
-                else:
-                    race_bonus = 3.0
-            elif grade == 'G3':
-                if chakujun == 1:
-                    race_bonus = 5.0
-                elif chakujun in [2, 3]:
-                    race_bonus = 3.0
-                else:
-                    race_bonus = 2.0
-            else:
-                race_bonus = 0.0
+            race_bonus = self.GRADE_BONUS_TABLE.get((grade, chakujun), default_bonus)
             
-            time_decay = 1.0 - (idx * 0.15)
+            time_decay = self.GRADE_TIME_DECAY[idx]
             bonus += race_bonus * time_decay
             
             if self.debug_mode:
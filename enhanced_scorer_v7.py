@@ -17,8 +17,11 @@ V6からの改善点:
 """
 
 import logging
+import re
+from bisect import bisect_left
+from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple
-from collections import Counter
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,6 +29,9 @@ logger = logging.getLogger(__name__)
 
 class CourseAnalyzer:
     """コース分析クラス"""
+    
+    # インスタンス状態を持たない（静的メソッドのみ）
+    __slots__ = ()
 
     # コースレコード一覧（芝・秒換算）
     # キー: (コース名, 距離)  ※コース名はdetect_track_variant後の詳細名
@@ -196,52 +202,53 @@ class CourseAnalyzer:
         },
     }
     
+    # 基準値の距離一覧（近似距離検索用に事前ソート）
+    SORTED_BASELINE_DISTANCES = {course: sorted(d) for course, d in BASELINE_3F.items()}
+    
+    @staticmethod
+    def nearest_distance(distances: List[int], distance: int) -> int:
+        """ソート済み距離一覧から最も近い距離を返す（等距離なら短い方）"""
+        idx = bisect_left(distances, distance)
+        if idx == 0:
+            return distances[0]
+        if idx == len(distances):
+            return distances[-1]
+        lower, upper = distances[idx - 1], distances[idx]
+        return lower if distance - lower <= upper - distance else upper
+    
+    # 内外回りの既定判定（distance_textに「外」「内」表記がない場合）
+    # 京都: 外回り固定距離 2200, 2400, 3000, 3200（内回りコースが存在しない）
+    #       内回り固定距離 1200
+    #       1400・1600: 新馬・未勝利→内回り／1勝クラス以上→外回り
+    #                   netkeibaは外回りのみ「外」表記のため、distance_textで正しく判定される
+    #       1800・2000: 内回りのみ存在 → 1200〜2000は内回りデフォルト
+    # 阪神: 内回り 1200, 1400, 1800, 2000, 2200（阪神大賞典GIIは内回り）
+    #       外回り 1600, 1800, 2000, 2400（宝塚記念GIは外回り）
+    #       ※1800・2000は内外両方存在するが、表記がない場合は外回りをデフォルトとする
+    # 新潟: 1600以下は内回り、1800以上は外回り
+    TRACK_VARIANT_RULES = {
+        '京都': lambda d: '京都外' if d in (2200, 2400, 3000, 3200) else '京都内',
+        '阪神': lambda d: '阪神内' if d <= 1400 or d == 2200 else '阪神外',
+        '新潟': lambda d: '新潟外' if d >= 1800 else '新潟内',
+    }
+    
     @staticmethod
+    @lru_cache(maxsize=2048)
     def detect_track_variant(course: str, distance: int, distance_text: str = '') -> str:
-        """内外回りを判定"""
-        if '外' in distance_text or '外回り' in distance_text:
+        """内外回りを判定（引数ごとにキャッシュ）"""
+        if '外' in distance_text:
             return f'{course}外'
-        elif '内' in distance_text or '内回り' in distance_text:
+        elif '内' in distance_text:
             return f'{course}内'
         
-        if course == '京都':
-            # 外回り固定距離: 2200, 2400, 3000, 3200（内回りコースが存在しない）
-            # 内回り固定距離: 1200
-            # 1400・1600: 新馬・未勝利→内回り／1勝クラス以上→外回り
-            #             netkeibaは外回りのみ「外」表記のため、distance_textで正しく判定される
-            # 1800・2000: 内回りのみ存在
-            if distance in [2200, 2400, 3000, 3200]:
-                return '京都外'
-            else:
-                return '京都内'   # 1200〜2000は内回りデフォルト（外回りはdistance_textの「外」で判定済み）
-        
-        elif course == '阪神':
-            # 内回り: 1200, 1400, 1800, 2000, 2200（阪神大賞典）
-            # 外回り: 1600, 1800, 2000, 2400
-            # ※1800・2000は内外両方存在するが、distance_textに情報がない場合は外回りをデフォルトとする
-            if distance <= 1400:
-                return '阪神内'
-            elif distance == 2200:
-                return '阪神内'   # 阪神大賞典（GII）は内回り
-            elif distance == 2400:
-                return '阪神外'   # 宝塚記念（GI）は外回り
-            else:
-                return '阪神外'   # 1600・1800・2000のデフォルトは外回り
-        
-        elif course == '新潟':
-            if distance <= 1600:
-                return '新潟内'
-            elif distance >= 1800:
-                return '新潟外'
-            else:
-                return '新潟内'
-        
-        return course
+        rule = CourseAnalyzer.TRACK_VARIANT_RULES.get(course)
+        return rule(distance) if rule else course
     
     @staticmethod
+    @lru_cache(maxsize=2048)
     def get_baseline_3f(course: str, distance: int, distance_text: str = '', 
                         baba: str = '良') -> float:
-        """上がり3Fの基準値を取得（馬場状態補正込み）"""
+        """上がり3Fの基準値を取得（馬場状態補正込み・引数ごとにキャッシュ）"""
         detailed_course = CourseAnalyzer.detect_track_variant(course, distance, distance_text)
         
         course_baselines = CourseAnalyzer.BASELINE_3F.get(detailed_course, {})
@@ -249,11 +256,11 @@ class CourseAnalyzer:
         if distance in course_baselines:
             baseline = course_baselines[distance]
         else:
-            distances = sorted(course_baselines.keys())
+            distances = CourseAnalyzer.SORTED_BASELINE_DISTANCES.get(detailed_course, [])
             if not distances:
                 baseline = 34.5 if distance <= 1800 else 35.5 if distance <= 2200 else 36.5
             else:
-                closest = min(distances, key=lambda x: abs(x - distance))
+                closest = CourseAnalyzer.nearest_distance(distances, distance)
                 baseline = course_baselines[closest]
                 diff = distance - closest
                 baseline += diff * 0.001
@@ -267,6 +274,9 @@ class CourseAnalyzer:
 class RunningStyleAnalyzer:
     """脚質分析クラス（コース特性強化版）"""
     
+    # インスタンス状態を持たない（静的メソッドのみ）
+    __slots__ = ()
+    
     COURSE_CHARACTERISTICS = {
         '東京': {'straight': 525, 'favor': ['差し', '追込']},
         '京都': {'straight': 403, 'favor': ['先行', '差し']},
@@ -280,6 +290,9 @@ class RunningStyleAnalyzer:
         '中京': {'straight': 412, 'favor': ['差し']},
     }
     
+    # 直線の長さだけを引く展開予測・相性補正用
+    STRAIGHT_LENGTHS = {course: info['straight'] for course, info in COURSE_CHARACTERISTICS.items()}
+    
     # 【新設】コース×距離別の脚質ボーナスウェイト
     COURSE_DISTANCE_STYLE_WEIGHTS = {
         '東京': {
@@ -345,6 +358,19 @@ class RunningStyleAnalyzer:
         },
     }
     
+    # 前に行く脚質（ペース予測で数える対象）
+    FRONT_STYLES = frozenset(('逃げ', '先行'))
+    
+    # ペース×脚質の基本ボーナス
+    PACE_STYLE_BONUS = {
+        'スロー': {'逃げ': 15.0, '先行': 12.0, '差し': 10.0, '追込': 8.0},
+        'ミドル': {'逃げ': 10.0, '先行': 12.0, '差し': 12.0, '追込': 10.0},
+        'ハイ': {'逃げ': 5.0, '先行': 8.0, '差し': 15.0, '追込': 18.0}
+    }
+    
+    # ウェイト定義のある距離一覧（近似距離検索用に事前ソート）
+    SORTED_STYLE_WEIGHT_DISTANCES = {course: sorted(d) for course, d in COURSE_DISTANCE_STYLE_WEIGHTS.items()}
+    
     @staticmethod
     def classify_running_style(position_4c: int, field_size: int, last_3f: float, 
                                race_avg_3f: float = 0) -> Dict:
@@ -384,12 +410,10 @@ class RunningStyleAnalyzer:
         if not horses:
             return {'pace': 'ミドル', 'front_ratio': 0.30}
         
-        style_counts = Counter(h.get('style', '不明') for h in horses if h.get('style') != '不明')
-        front_runners = style_counts.get('逃げ', 0) + style_counts.get('先行', 0)
+        front_runners = sum(1 for h in horses if h.get('style') in RunningStyleAnalyzer.FRONT_STYLES)
         
         # コース特性を取得
-        course_info = RunningStyleAnalyzer.COURSE_CHARACTERISTICS.get(course, {})
-        straight_length = course_info.get('straight', 400)
+        straight_length = RunningStyleAnalyzer.STRAIGHT_LENGTHS.get(course, 400)
         
         # 直線の長さでペース判定基準を調整
         if straight_length >= 500:
@@ -436,13 +460,8 @@ class RunningStyleAnalyzer:
     def calculate_style_match_bonus(style: str, pace: str, course: str = '東京', 
                                    distance: int = 1600) -> float:
         """脚質×ペース×コースの相性ボーナス"""
-        bonus_map = {
-            'スロー': {'逃げ': 15.0, '先行': 12.0, '差し': 10.0, '追込': 8.0},
-            'ミドル': {'逃げ': 10.0, '先行': 12.0, '差し': 12.0, '追込': 10.0},
-            'ハイ': {'逃げ': 5.0, '先行': 8.0, '差し': 15.0, '追込': 18.0}
-        }
-        
-        base_bonus = bonus_map.get(pace, {}).get(style, 0.0)
+        pace_bonus = RunningStyleAnalyzer.PACE_STYLE_BONUS.get(pace)
+        base_bonus = pace_bonus.get(style, 0.0) if pace_bonus else 0.0
         
         # コース特性による補正
         course_info = RunningStyleAnalyzer.COURSE_CHARACTERISTICS.get(course, {})
@@ -454,8 +473,9 @@ class RunningStyleAnalyzer:
         return base_bonus
     
     @staticmethod
+    @lru_cache(maxsize=2048)
     def get_style_weight(course: str, distance: int, style: str) -> float:
-        """コース×距離別の脚質ボーナスウェイトを取得"""
+        """コース×距離別の脚質ボーナスウェイトを取得（引数ごとにキャッシュ）"""
         course_weights = RunningStyleAnalyzer.COURSE_DISTANCE_STYLE_WEIGHTS.get(course, {})
         
         # 指定距離のウェイトを取得
@@ -463,23 +483,57 @@ class RunningStyleAnalyzer:
             return course_weights[distance].get(style, 1.0)
         
         # 最も近い距離のウェイトを使用
-        distances = sorted(course_weights.keys())
+        distances = RunningStyleAnalyzer.SORTED_STYLE_WEIGHT_DISTANCES.get(course)
         if not distances:
             return 1.0
         
-        closest_distance = min(distances, key=lambda x: abs(x - distance))
+        closest_distance = CourseAnalyzer.nearest_distance(distances, distance)
         return course_weights[closest_distance].get(style, 1.0)
 
 
+class HistoryColumns:
+    """
+    過去走データの列形式ビュー（直近5走）
+
+    各評価メソッドで共通に参照する項目を1頭につき1回だけ取り出し、
+    レースごとの辞書参照を繰り返さないようにする。
+    トラック種別の補完・地方判定・グレード判定の結果は
+    RaceScorer._classify_history で埋める（未判定ならNone）。
+    """
+
+    __slots__ = ('size', 'dist', 'last_3f', 'chakujun', 'goal_time_diff', 'course', 'track_type', 'race_name',
+                 'resolved_track_type', 'is_local', 'grade', 'grade_reliability')
+
+    def __init__(self, history_data: List[Dict], limit: int = 5):
+        races = history_data[:limit]
+        self.size = len(races)
+        self.dist = [r.get('dist', 0) for r in races]
+        self.last_3f = [r.get('last_3f', 0.0) for r in races]
+        self.chakujun = [r.get('chakujun', 99) for r in races]
+        self.goal_time_diff = [r.get('goal_time_diff', None) for r in races]
+        self.course = [r.get('course', '') for r in races]
+        self.track_type = [r.get('track_type', '') for r in races]
+        self.race_name = [r.get('race_name', '') for r in races]
+        self.resolved_track_type = None
+        self.is_local = None
+        self.grade = None
+        self.grade_reliability = None
+
+
 class RaceScorer:
     """レーススコアリングクラス（V6: 新馬戦2戦目ブースト追加版）"""
     
+    __slots__ = ('debug_mode', 'style_analyzer', 'course_analyzer')
+    
     def __init__(self, debug_mode: bool = False):
         self.debug_mode = debug_mode
         self.style_analyzer = RunningStyleAnalyzer()
         self.course_analyzer = CourseAnalyzer()
     
-    def detect_race_grade(self, race_name: str):
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def detect_race_grade(race_name: str) -> Tuple[str, float]:
+        """レースグレードと信頼度を判定（同じレース名は再判定しない）"""
         if not race_name:
             return "不明", 0.60
 
@@ -509,15 +563,15 @@ class RaceScorer:
     def _is_local_race(self, race_name: str, course: str) -> bool:
         """地方競馬かどうか判定（交流重賞は除外）"""
         # 交流重賞は地方競馬場開催でも地方扱いしない
-        exchange_race_keywords = ['JpnI', 'JpnII', 'JpnIII', 'Jpn1', 'Jpn2', 'Jpn3']
-        if any(keyword in race_name for keyword in exchange_race_keywords):
+        if self.EXCHANGE_RACE_PATTERN.search(race_name):
             return False
         
-        local_courses = ['大井', '川崎', '船橋', '浦和', '門別', '盛岡', '水沢', '金沢', '笠松', '名古屋', '園田', '姫路', '高知', '佐賀']
-        return any(lc in course or lc in race_name for lc in local_courses)
+        return bool(self.LOCAL_COURSE_PATTERN.search(course) or self.LOCAL_COURSE_PATTERN.search(race_name))
     
-    def _get_track_type_by_distance(self, distance: int, race_name: str, course: str) -> str:
-        """距離からトラックタイプを推定"""
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _get_track_type_by_distance(distance: int, race_name: str, course: str) -> str:
+        """距離からトラックタイプを推定（引数ごとにキャッシュ）"""
         if 'ダ' in race_name or 'ダート' in race_name:
             return 'ダート'
         elif '障' in race_name:
@@ -532,8 +586,32 @@ class RaceScorer:
         else:
             return '芝'
     
-    def _get_default_baseline_3f(self, distance: int, track_type: str) -> float:
-        """デフォルトの上がり3F基準値"""
+    def _classify_history(self, history_data: List[Dict]) -> HistoryColumns:
+        """
+        直近5走の列ビューを作り、レースごとの判定結果を1回だけ求めておく
+        
+        上がり3F・後半4F・危険フラグの各評価で同じレースを繰り返し
+        判定しないよう、トラック種別（未設定・不明なら距離から推定）、
+        地方判定、グレードと信頼度を列として持たせる。
+        """
+        cols = HistoryColumns(history_data)
+        resolved_track_type = []
+        for idx in range(cols.size):
+            track_type = cols.track_type[idx]
+            if not track_type or track_type == '不明':
+                track_type = self._get_track_type_by_distance(cols.dist[idx], cols.race_name[idx], cols.course[idx])
+            resolved_track_type.append(track_type)
+        cols.resolved_track_type = resolved_track_type
+        cols.is_local = [self._is_local_race(name, course) for name, course in zip(cols.race_name, cols.course)]
+        grades = [self.detect_race_grade(name) for name in cols.race_name]
+        cols.grade = [grade for grade, _ in grades]
+        cols.grade_reliability = [reliability for _, reliability in grades]
+        return cols
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _get_default_baseline_3f(distance: int, track_type: str) -> float:
+        """デフォルトの上がり3F基準値（引数ごとにキャッシュ）"""
         if track_type == 'ダート':
             if distance <= 1400:
                 return 37.5
@@ -551,7 +629,61 @@ class RaceScorer:
             else:
                 return 36.5
     
-    def _calculate_distance_score(self, history_data: List[Dict], target_distance: int) -> float:
+    # 距離・コース適性の時系列重み（1走前〜5走前）
+    APTITUDE_TIME_WEIGHTS = (1.0, 0.8, 0.6, 0.5, 0.4)
+    
+    # 上がり3F相対評価の着順ボーナス（重賞は2-5着でも一定の評価、該当なしは0点）
+    LAST_3F_FINISH_BONUS_GRADED = {1: 3.0, 2: 2.0, 3: 2.0, 4: 1.5, 5: 1.5}
+    LAST_3F_FINISH_BONUS = {1: 3.0, 2: 2.0, 3: 1.0}
+    
+    # 後半4F評価のレース格別信頼度（detect_race_gradeの信頼度とは別スケール）
+    LATE_4F_RELIABILITY = {
+        'G1': 1.0, 'G2': 0.95, 'G3': 0.9,
+        'JpnI': 1.0, 'JpnII': 0.95, 'JpnIII': 0.9,
+        'OP': 0.85
+    }
+    
+    # 後半4F評価の着順係数: 着順の上限（以下）ごと、1着は1.0
+    FINISH_RANK_LIMITS = (3, 5, 10)
+    LATE_4F_FINISH_BONUS = (0.9, 0.75, 0.5, 0.3)
+
+    def _performance_coef(self, chakujun: int, time_diff: Optional[float]) -> float:
+        """
+        距離・コース適性用の成績係数
+
+        着差があれば着差で、なければ着順で判定:
+          着差0.3s以内->1.00 / 0.6s->0.85 / 1.0s->0.70 / 1.5s->0.50 / 2.5s->0.30 / 超->0.10
+          1着->1.00 / 2着->0.85 / 3着->0.70 / 5着以内->0.50 / 9着以内->0.30 / それ以下->0.10
+        """
+        if time_diff is not None and time_diff != 0:
+            margin = abs(float(time_diff))
+            if margin <= 0.3:
+                return 1.00
+            elif margin <= 0.6:
+                return 0.85
+            elif margin <= 1.0:
+                return 0.70
+            elif margin <= 1.5:
+                return 0.50
+            elif margin <= 2.5:
+                return 0.30
+            else:
+                return 0.10
+
+        if chakujun == 1:
+            return 1.00
+        elif chakujun == 2:
+            return 0.85
+        elif chakujun == 3:
+            return 0.70
+        elif chakujun <= 5:
+            return 0.50
+        elif chakujun <= 9:
+            return 0.30
+        else:
+            return 0.10
+
+    def _calculate_distance_score(self, cols: HistoryColumns, target_distance: int) -> float:
         """
         距離適性スコア（重み付き合計版・直近5走評価）
 
@@ -573,20 +705,18 @@ class RaceScorer:
 
         最終スコア: 重み付き正規化後、最大15点キャップ
         """
-        if not history_data:
+        if not cols.size:
             return 0.0
 
-        TIME_WEIGHTS = [1.0, 0.8, 0.6, 0.5, 0.4]
-
         weighted_score = 0.0
         weighted_denom = 0.0
 
-        for idx, race in enumerate(history_data[:5]):
-            dist = race.get('dist', 0)
+        for idx in range(cols.size):
+            dist = cols.dist[idx]
             if dist <= 0:
                 continue
 
-            time_w = TIME_WEIGHTS[idx]
+            time_w = self.APTITUDE_TIME_WEIGHTS[idx]
             diff = abs(target_distance - dist)
 
             # 線形補間: 0m差→15点、200m差→10点、それ以外はステップ
@@ -599,40 +729,13 @@ class RaceScorer:
             else:
                 base_pts = 0.0
 
-            chakujun  = race.get('chakujun', 99)
-            time_diff = race.get('goal_time_diff', None)
+            chakujun = cols.chakujun[idx]
 
             # 除外・中止・取消（99着または0着）はスキップ
             if chakujun == 0 or chakujun >= 90:
                 continue
 
-            if time_diff is not None and time_diff != 0:
-                margin = abs(float(time_diff))
-                if margin <= 0.3:
-                    coef = 1.00
-                elif margin <= 0.6:
-                    coef = 0.85
-                elif margin <= 1.0:
-                    coef = 0.70
-                elif margin <= 1.5:
-                    coef = 0.50
-                elif margin <= 2.5:
-                    coef = 0.30
-                else:
-                    coef = 0.10
-            else:
-                if chakujun == 1:
-                    coef = 1.00
-                elif chakujun == 2:
-                    coef = 0.85
-                elif chakujun == 3:
-                    coef = 0.70
-                elif chakujun <= 5:
-                    coef = 0.50
-                elif chakujun <= 9:
-                    coef = 0.30
-                else:
-                    coef = 0.10
+            coef = self._performance_coef(chakujun, cols.goal_time_diff[idx])
 
             weighted_score += base_pts * coef * time_w
             weighted_denom += time_w
@@ -647,13 +750,17 @@ class RaceScorer:
     JRA_COURSES  = ['札幌', '函館', '福島', '新潟', '東京', '中山', '中京', '京都', '阪神', '小倉']
     LOCAL_COURSES = ['大井', '川崎', '船橋', '浦和', '門別', '盛岡', '水沢', '金沢', '笠松', '名古屋', '園田', '姫路', '高知', '佐賀']
 
+    # 地方競馬場名・交流重賞（JpnI/II/III表記）の検出用（1回のsearchで全候補を走査）
+    LOCAL_COURSE_PATTERN = re.compile('|'.join(map(re.escape, LOCAL_COURSES)))
+    EXCHANGE_RACE_PATTERN = re.compile(r'Jpn[I123]')
+
     def _is_jra_course(self, course: str) -> bool:
         return any(jra in course for jra in self.JRA_COURSES)
 
     def _is_local_course(self, course: str) -> bool:
-        return any(lc in course for lc in self.LOCAL_COURSES)
+        return self.LOCAL_COURSE_PATTERN.search(course) is not None
 
-    def _calculate_course_score(self, history_data: List[Dict], target_course: str,
+    def _calculate_course_score(self, cols: HistoryColumns, target_course: str,
                                 target_track_type: str = None) -> float:
         """
         コース適性スコア（重み付き合計版・直近5走評価）
@@ -669,25 +776,23 @@ class RaceScorer:
 
         最終スコア: 重み付き正規化後、最大15点キャップ
         """
-        if not history_data:
+        if not cols.size:
             return 0.0
 
-        TIME_WEIGHTS = [1.0, 0.8, 0.6, 0.5, 0.4]
-
         weighted_score = 0.0
         weighted_denom = 0.0
 
-        for idx, race in enumerate(history_data[:5]):
-            course     = race.get('course', '')
-            track_type = race.get('track_type', '')
-            chakujun   = race.get('chakujun', 99)
-            time_diff  = race.get('goal_time_diff', None)
+        for idx in range(cols.size):
+            course     = cols.course[idx]
+            track_type = cols.track_type[idx]
+            chakujun   = cols.chakujun[idx]
+            time_diff  = cols.goal_time_diff[idx]
 
             # 除外・中止・取消（99着または0着）はスキップ
             if chakujun == 0 or chakujun >= 90:
                 continue
 
-            time_w = TIME_WEIGHTS[idx]
+            time_w = self.APTITUDE_TIME_WEIGHTS[idx]
 
             same_course = (course == target_course)
             same_track  = (not target_track_type or not track_type
@@ -701,33 +806,7 @@ class RaceScorer:
             else:
                 base_pts = 0.0
 
-            if time_diff is not None and time_diff != 0:
-                margin = abs(float(time_diff))
-                if margin <= 0.3:
-                    coef = 1.00
-                elif margin <= 0.6:
-                    coef = 0.85
-                elif margin <= 1.0:
-                    coef = 0.70
-                elif margin <= 1.5:
-                    coef = 0.50
-                elif margin <= 2.5:
-                    coef = 0.30
-                else:
-                    coef = 0.10
-            else:
-                if chakujun == 1:
-                    coef = 1.00
-                elif chakujun == 2:
-                    coef = 0.85
-                elif chakujun == 3:
-                    coef = 0.70
-                elif chakujun <= 5:
-                    coef = 0.50
-                elif chakujun <= 9:
-                    coef = 0.30
-                else:
-                    coef = 0.10
+            coef = self._performance_coef(chakujun, time_diff)
 
             weighted_score += base_pts * coef * time_w
             weighted_denom += time_w
@@ -793,13 +872,27 @@ class RaceScorer:
         
         return round(penalty, 1)
     
+    # 長期休養ペナルティ: 休養月数の上限（以内）ごとのペナルティ、末尾は11ヶ月超
+    LAYOFF_MONTH_LIMITS = (4, 5, 6, 7, 8, 9, 10, 11)
+    LAYOFF_PENALTIES = (-4.0, -6.0, -8.0, -10.0, -11.0, -12.0, -14.0, -16.0, -20.0)
+    
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _parse_race_date(date_str: str) -> datetime:
+        """レース日付（YYYY/MM/DD）を解析（同じ日付文字列は再解析しない）"""
+        return datetime.strptime(date_str, '%Y/%m/%d')
+    
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _race_day_number(date_str: str) -> int:
+        """レース日付を通し日数（序数）に変換（2走間の間隔を整数の差で求めるため）"""
+        return RaceScorer._parse_race_date(date_str).toordinal()
+    
     def _calculate_layoff_penalty(self, history_data: List[Dict]) -> float:
         """長期休養ペナルティ"""
         if not history_data:
             return 0.0
         
-        from datetime import datetime
-        
         last_race = history_data[0]
         race_date_str = last_race.get('race_date', '')
         
@@ -807,31 +900,16 @@ class RaceScorer:
             return 0.0
         
         try:
-            race_date = datetime.strptime(race_date_str, '%Y/%m/%d')
+            race_date = self._parse_race_date(race_date_str)
             current_date = datetime.now()
             days_since = (current_date - race_date).days
             months_since = days_since / 30.44
             
             if days_since <= 120:  # 4ヶ月未満（= 3ヶ月以内）はペナルティなし
                 penalty = 0.0
-            elif months_since <= 4:
-                penalty = -4.0
-            elif months_since <= 5:
-                penalty = -6.0
-            elif months_since <= 6:
-                penalty = -8.0
-            elif months_since <= 7:
-                penalty = -10.0
-            elif months_since <= 8:
-                penalty = -11.0
-            elif months_since <= 9:
-                penalty = -12.0
-            elif months_since <= 10:
-                penalty = -14.0
-            elif months_since <= 11:
-                penalty = -16.0
             else:
-                penalty = -20.0
+                # 「Nヶ月以内」の上限で区切ったテーブルを引く（11ヶ月超は-20点）
+                penalty = self.LAYOFF_PENALTIES[bisect_left(self.LAYOFF_MONTH_LIMITS, months_since)]
             
             if self.debug_mode and penalty < 0:
                 logger.debug(f"  長期休養ペナルティ: {months_since:.1f}ヶ月ぶり → {penalty:.1f}点")
@@ -843,53 +921,42 @@ class RaceScorer:
                 logger.debug(f"  日付解析エラー: {e}")
             return 0.0
     
-    def _calculate_grade_race_bonus(self, history_data: List[Dict]) -> float:
+    # 重賞出走ボーナス: (グレード, 着順) → ボーナス、着順が該当しなければ GRADE_BONUS_DEFAULT
+    GRADE_BONUS_TABLE = {
+        ('G1', 1): 10.0, ('G1', 2): 8.0, ('G1', 3): 8.0,
+        ('G2', 1): 7.0, ('G2', 2): 5.0, ('G2', 3): 5.0,
+        ('G3', 1): 5.0, ('G3', 2): 3.0, ('G3', 3): 3.0,
+    }
+    GRADE_BONUS_DEFAULT = {'G1': 5.0, 'G2': 3.0, 'G3': 2.0}
+    # 直近からの経過走数による減衰（1.0 - idx * 0.15）
+    GRADE_TIME_DECAY = tuple(1.0 - (idx * 0.15) for idx in range(5))
+    
+    def _calculate_grade_race_bonus(self, cols: HistoryColumns) -> float:
         """重賞出走ボーナス"""
         bonus = 0.0
         
-        for idx, race in enumerate(history_data[:5]):
-            race_name = race.get('race_name', '')
-            chakujun = race.get('chakujun', 99)
+        for idx in range(cols.size):
+            chakujun = cols.chakujun[idx]
 
             # 除外・中止・取消はスキップ（出走できていないため重賞ボーナス対象外）
             if chakujun == 0 or chakujun >= 90:
                 continue
 
-            grade, _ = self.detect_race_grade(race_name)
+            # グレードは _classify_history で判定済み
+            grade = cols.grade[idx]
             
-            if grade not in ['G1', 'G2', 'G3']:
+            default_bonus = self.GRADE_BONUS_DEFAULT.get(grade)
+            if default_bonus is None:
                 continue
             
             # グレード別のボーナス
-            if grade == 'G1':
-                if chakujun == 1:
-                    race_bonus = 10.0
-                elif chakujun in [2, 3]:
-                    race_bonus = 8.0
-                else:
-                    race_bonus = 5.0
-            elif grade == 'G2':
-                if chakujun == 1:
-                    race_bonus = 7.0
-                elif chakujun in [2, 3]:
-                    race_bonus = 5.0
-                else:
-                    race_bonus = 3.0
-            elif grade == 'G3':
-                if chakujun == 1:
-                    race_bonus = 5.0
-                elif chakujun in [2, 3]:
-                    race_bonus = 3.0
-                else:
-                    race_bonus = 2.0
-            else:
-                race_bonus = 0.0
+            race_bonus = self.GRADE_BONUS_TABLE.get((grade, chakujun), default_bonus)
             
-            time_decay = 1.0 - (idx * 0.15)
+            time_decay = self.GRADE_TIME_DECAY[idx]
             bonus += race_bonus * time_decay
             
             if self.debug_mode:
-                logger.debug(f"  重賞出走ボーナス: {race_name} {grade} {chakujun}着 → +{race_bonus * time_decay:.1f}点")
+                logger.debug(f"  重賞出走ボーナス: {cols.race_name[idx]} {grade} {chakujun}着 → +{race_bonus * time_decay:.1f}点")
         
         return round(bonus, 1)
     
@@ -930,57 +997,49 @@ class RaceScorer:
         Returns:
             True: ペナルティ軽減, False: 通常ペナルティ
         """
-        if loss_index >= len(history_data):
+        # 軽減条件はすべて前走（loss_index + 1）との比較なので、前走がなければ対象外
+        if loss_index + 1 >= len(history_data):
             return False
         
         loss_race = history_data[loss_index]
+        prev_race = history_data[loss_index + 1]
         loss_distance = loss_race.get('dist', 0)
         
         # 1. 距離の大幅変更（600m以上）
-        if loss_index + 1 < len(history_data):
-            prev_race = history_data[loss_index + 1]
-            prev_distance = prev_race.get('dist', 0)
-            
-            if abs(loss_distance - prev_distance) >= 600:
-                if self.debug_mode:
-                    logger.debug(f"    大敗ペナルティ軽減: 距離変更 {prev_distance}m → {loss_distance}m")
-                return True
+        prev_distance = prev_race.get('dist', 0)
+        if abs(loss_distance - prev_distance) >= 600:
+            if self.debug_mode:
+                logger.debug(f"    大敗ペナルティ軽減: 距離変更 {prev_distance}m → {loss_distance}m")
+            return True
         
         # 2. 中止 → 大敗（スクレイパーで中止はスキップされるが、手動データ等の互換のため残す）
-        if loss_index + 1 < len(history_data):
-            prev_race = history_data[loss_index + 1]
-            prev_chakujun = prev_race.get('chakujun', 0)
-            
-            # 着順0=中止/除外/取消
-            if prev_chakujun == 0:
-                if self.debug_mode:
-                    logger.debug(f"    大敗ペナルティ軽減: 前走中止/除外/取消")
-                return True
+        # 着順0=中止/除外/取消
+        if prev_race.get('chakujun', 0) == 0:
+            if self.debug_mode:
+                logger.debug(f"    大敗ペナルティ軽減: 前走中止/除外/取消")
+            return True
         
         # 3. 休養明け初戦の大敗
-        if loss_index + 1 < len(history_data):
-            from datetime import datetime
-            
-            loss_date_str = loss_race.get('race_date', '')
-            prev_race = history_data[loss_index + 1]
-            prev_date_str = prev_race.get('race_date', '')
-            
-            if loss_date_str and prev_date_str:
-                try:
-                    loss_date = datetime.strptime(loss_date_str, '%Y/%m/%d')
-                    prev_date = datetime.strptime(prev_date_str, '%Y/%m/%d')
-                    days_since = (loss_date - prev_date).days
-                    
-                    # 4ヶ月以上の休養明け
-                    if days_since >= 120:
-                        if self.debug_mode:
-                            logger.debug(f"    大敗ペナルティ軽減: 休養明け初戦（{days_since}日ぶり）")
-                        return True
-                except Exception:
-                    pass
+        loss_date_str = loss_race.get('race_date', '')
+        prev_date_str = prev_race.get('race_date', '')
+        
+        if loss_date_str and prev_date_str:
+            try:
+                days_since = self._race_day_number(loss_date_str) - self._race_day_number(prev_date_str)
+                
+                # 4ヶ月以上の休養明け
+                if days_since >= 120:
+                    if self.debug_mode:
+                        logger.debug(f"    大敗ペナルティ軽減: 休養明け初戦（{days_since}日ぶり）")
+                    return True
+            except Exception:
+                pass
         
         return False
     
+    # 連続大敗ペナルティ: 実質連続回数（0, 1, 2, 3以上）ごとの点数
+    BIG_LOSS_PENALTIES = (0.0, -3.0, -8.0, -15.0)
+    
     def _calculate_consecutive_big_loss_penalty(self, history_data: List[Dict]) -> float:
         """
         連続大敗ペナルティの計算
@@ -998,41 +1057,37 @@ class RaceScorer:
         if not history_data:
             return 0.0
         
-        # 連続大敗回数をカウント
-        consecutive_losses = self.count_consecutive_big_losses(history_data, threshold=1.1)
-        
-        if consecutive_losses == 0:
-            return 0.0
-        
-        # 軽減条件をチェック
-        # 最新の大敗から順にチェックし、軽減対象が見つかったらそこで連続をリセット
+        # 最新走から1回の走査で、大敗が途切れるか軽減対象の大敗が見つかるまでを数える
+        # （軽減対象の大敗が見つかったら、そこで連続をリセット）
         reduced_count = 0
-        for i in range(consecutive_losses):
-            should_reduce = self._should_reduce_big_loss_penalty(history_data, i)
+        for i, race in enumerate(history_data):
+            diff = race.get("goal_time_diff")
+            if not (diff is not None and diff >= 1.1):
+                break
             
-            if not should_reduce:
-                reduced_count += 1
-            else:
-                # 軽減対象の大敗が見つかったら、ここで連続をリセット
+            if self._should_reduce_big_loss_penalty(history_data, i):
                 if self.debug_mode:
                     logger.debug(f"    大敗{i+1}回目（{i+1}走前）: 軽減対象のため、ここで連続リセット")
                 break
+            
+            reduced_count += 1
         
-        # 実質的な連続大敗回数でペナルティを計算
         if reduced_count == 0:
-            penalty = 0.0
-        elif reduced_count == 1:
-            penalty = -3.0
-        elif reduced_count == 2:
-            penalty = -8.0
-        else:
-            penalty = -15.0
+            return 0.0
+        
+        # 実質的な連続大敗回数でペナルティを計算（3連続以上は同じ）
+        penalty = self.BIG_LOSS_PENALTIES[min(reduced_count, 3)]
         
-        if self.debug_mode and penalty < 0:
+        if self.debug_mode:
+            consecutive_losses = self.count_consecutive_big_losses(history_data, threshold=1.1)
             logger.debug(f"  連続大敗ペナルティ: {consecutive_losses}回連続 → 実質{reduced_count}回 → {penalty:.1f}点")
         
         return penalty
 
+    # 連勝着差ボーナス・CRスコアの時系列重み（1走前から順）
+    WINNING_STREAK_TIME_WEIGHTS = (1.0, 0.7, 0.5)
+    COURSE_RECORD_TIME_WEIGHTS = (1.0, 0.7, 0.5, 0.4, 0.3)
+    
     def _calculate_winning_streak_bonus(self, history_data: List[Dict]) -> float:
         """
         【新】連勝着差ボーナスの計算
@@ -1052,7 +1107,6 @@ class RaceScorer:
         if not history_data:
             return 0.0
 
-        TIME_WEIGHTS = [1.0, 0.7, 0.5]
         bonus = 0.0
 
         for idx, race in enumerate(history_data[:3]):
@@ -1072,7 +1126,7 @@ class RaceScorer:
             else:
                 pts = 1.5
 
-            w = TIME_WEIGHTS[idx]
+            w = self.WINNING_STREAK_TIME_WEIGHTS[idx]
             bonus += pts * w
 
             if self.debug_mode:
@@ -1087,6 +1141,9 @@ class RaceScorer:
             logger.debug(f"  連勝着差ボーナス 合計: +{result}点（上限10点）")
         return result
 
+    # 新馬戦2戦目ブースト: 新馬戦の着順別ベースボーナス（4着以下は0点）
+    SHINBA_FINISH_BONUS = {1: 3.0, 2: 1.5, 3: 0.5}
+    
     def _calculate_shinba_second_race_boost(self, history_data: List[Dict]) -> float:
         """
         【新】新馬戦2戦目ブーストの計算
@@ -1120,21 +1177,11 @@ class RaceScorer:
         
         # ベースボーナス（着順別）※V7で削減（過大評価防止）
         chakujun = first_race.get('chakujun', 99)
-        if chakujun == 1:
-            boost = 3.0
-            if self.debug_mode:
-                logger.debug("    新馬1着ベースボーナス: +3点")
-        elif chakujun == 2:
-            boost = 1.5
-            if self.debug_mode:
-                logger.debug("    新馬2着ベースボーナス: +1.5点")
-        elif chakujun == 3:
-            boost = 0.5
-            if self.debug_mode:
-                logger.debug("    新馬3着ベースボーナス: +0.5点")
-        else:
-            boost = 0.0
-            if self.debug_mode:
+        boost = self.SHINBA_FINISH_BONUS.get(chakujun, 0.0)
+        if self.debug_mode:
+            if boost:
+                logger.debug(f"    新馬{chakujun}着ベースボーナス: +{boost:g}点")
+            else:
                 logger.debug("    新馬4着以下: ベースボーナスなし")
         
         # 上がり3F評価
@@ -1146,37 +1193,40 @@ class RaceScorer:
         # goal_time_diffは勝ち馬との差（正=負け）。scraper側の格納方法に合わせて絶対値で扱う
         margin = abs(my_goal_time_diff) if my_goal_time_diff else 0.0
 
+        # レース平均上がり3Fを計算（上がり上位・後方差しの両判定で共用、算出不可なら0）
+        race_avg_3f = 0.0
         if my_last_3f > 0 and all_horses_results:
-            # レース平均上がり3Fを計算
-            valid_3f = [h.get('last_3f', 0) for h in all_horses_results if h.get('last_3f', 0) > 0]
+            valid_3f = [v for v in (h.get('last_3f', 0) for h in all_horses_results) if v > 0]
             if valid_3f:
                 race_avg_3f = sum(valid_3f) / len(valid_3f)
-                speed_diff = race_avg_3f - my_last_3f
-
-                # 0.5秒以上速い場合は上がり上位と判定
-                if speed_diff >= 0.5:
-                    # ── 着差による上がりボーナス制限 ──────────────────────────
-                    # 大差負けで上がり最速でも「末脚が届いていない」ため減額
-                    # 着差1.1s以上: ボーナス無効（大敗扱い・連続大敗ペナルティと整合）
-                    # 着差0.7s以上: ボーナス半減（脚は使えているが届かなかった）
-                    # 着差0.7s未満: 通常通り+5点
-                    if margin >= 1.1:
-                        agari_bonus = 0.0
-                        margin_note = f"着差{margin:.2f}s大敗のためボーナス無効"
-                    elif margin >= 0.7:
-                        agari_bonus = 1.0
-                        margin_note = f"着差{margin:.2f}sのため半減"
-                    else:
-                        agari_bonus = 2.0  # V7: +5→+2点に削減
-                        margin_note = ""
 
-                    boost += agari_bonus
-                    if self.debug_mode:
-                        note = f" [{margin_note}]" if margin_note else ""
-                        logger.debug(
-                            f"    新馬で上がり上位（平均{race_avg_3f:.2f}s vs 自身{my_last_3f:.2f}s、"
-                            f"差{speed_diff:+.2f}s）: +{agari_bonus:.1f}点{note}"
-                        )
+        if race_avg_3f > 0:
+            speed_diff = race_avg_3f - my_last_3f
+
+            # 0.5秒以上速い場合は上がり上位と判定
+            if speed_diff >= 0.5:
+                # ── 着差による上がりボーナス制限 ──────────────────────────
+                # 大差負けで上がり最速でも「末脚が届いていない」ため減額
+                # 着差1.1s以上: ボーナス無効（大敗扱い・連続大敗ペナルティと整合）
+                # 着差0.7s以上: ボーナス半減（脚は使えているが届かなかった）
+                # 着差0.7s未満: 通常通り+5点
+                if margin >= 1.1:
+                    agari_bonus = 0.0
+                    margin_note = f"着差{margin:.2f}s大敗のためボーナス無効"
+                elif margin >= 0.7:
+                    agari_bonus = 1.0
+                    margin_note = f"着差{margin:.2f}sのため半減"
+                else:
+                    agari_bonus = 2.0  # V7: +5→+2点に削減
+                    margin_note = ""
+
+                boost += agari_bonus
+                if self.debug_mode:
+                    note = f" [{margin_note}]" if margin_note else ""
+                    logger.debug(
+                        f"    新馬で上がり上位（平均{race_avg_3f:.2f}s vs 自身{my_last_3f:.2f}s、"
+                        f"差{speed_diff:+.2f}s）: +{agari_bonus:.1f}点{note}"
+                    )
 
         # 道中後方 → 直線伸び評価
         position_4c = first_race.get('position_4c', 0)
@@ -1188,22 +1238,18 @@ class RaceScorer:
             # 4角位置が後ろ50%以内（道中後方）
             if position_ratio > 0.50:
                 # かつ上がりが速い（レース平均より速い）
-                if my_last_3f > 0 and all_horses_results:
-                    valid_3f = [h.get('last_3f', 0) for h in all_horses_results if h.get('last_3f', 0) > 0]
-                    if valid_3f:
-                        race_avg_3f = sum(valid_3f) / len(valid_3f)
-                        if my_last_3f < race_avg_3f:
-                            # 着差1.1s以上の大敗では後方差しボーナスも無効
-                            if margin >= 1.1:
-                                if self.debug_mode:
-                                    logger.debug(
-                                        f"    道中後方（{position_4c}/{field_size}番手）→"
-                                        f"着差{margin:.2f}s大敗のため後方差しボーナス無効"
-                                    )
-                            else:
-                                boost += 1.5  # V7: +3→+1.5点に削減
-                                if self.debug_mode:
-                                    logger.debug(f"    道中後方（{position_4c}/{field_size}番手）→直線伸び: +1.5点")
+                if race_avg_3f > 0 and my_last_3f < race_avg_3f:
+                    # 着差1.1s以上の大敗では後方差しボーナスも無効
+                    if margin >= 1.1:
+                        if self.debug_mode:
+                            logger.debug(
+                                f"    道中後方（{position_4c}/{field_size}番手）→"
+                                f"着差{margin:.2f}s大敗のため後方差しボーナス無効"
+                            )
+                    else:
+                        boost += 1.5  # V7: +3→+1.5点に削減
+                        if self.debug_mode:
+                            logger.debug(f"    道中後方（{position_4c}/{field_size}番手）→直線伸び: +1.5点")
         
         if self.debug_mode:
             logger.debug(f"  → 新馬戦2戦目ブースト合計: +{boost:.1f}点")
@@ -1212,31 +1258,27 @@ class RaceScorer:
     
     def calculate_last_3f_relative_score(self, history_data: List[Dict], target_track_type: str,
                                         target_course: str = '東京', target_distance: int = 1600,
-                                        target_baba: str = '良') -> float:
+                                        target_baba: str = '良', cols: Optional[HistoryColumns] = None) -> float:
         """上がり3F相対評価スコア"""
+        if cols is None:
+            cols = self._classify_history(history_data)
         score = 0.0
         
         for idx, race in enumerate(history_data[:5]):
-            distance = race.get('dist', 0)
-            my_last_3f = race.get('last_3f', 0.0)
-            race_name = race.get('race_name', '')
-            course = race.get('course', '')
-            baba = race.get('baba', '良')
+            distance = cols.dist[idx]
+            my_last_3f = cols.last_3f[idx]
+            chakujun = cols.chakujun[idx]
 
             # 除外・中止・取消はスキップ
-            _chakujun_check = race.get('chakujun', 99)
-            if _chakujun_check == 0 or _chakujun_check >= 90:
+            if chakujun == 0 or chakujun >= 90:
                 continue
 
             if distance <= 0 or my_last_3f <= 0:
                 continue
             
-            race_track_type = race.get('track_type', None)
-            if not race_track_type or race_track_type == '不明':
-                race_track_type = self._get_track_type_by_distance(distance, race_name, course)
-            
+            race_track_type = cols.resolved_track_type[idx]
             track_type_mismatch = (race_track_type != target_track_type)
-            is_local = self._is_local_race(race_name, course)
+            is_local = cols.is_local[idx]
             
             all_horses_results = race.get('all_horses_results', [])
             
@@ -1244,39 +1286,38 @@ class RaceScorer:
             race_avg_3f = self._get_default_baseline_3f(distance, race_track_type)
             comparison_type = "デフォルト基準値"
             
-            if all_horses_results:
-                goal_times = [h.get('goal_time_diff', 0) for h in all_horses_results if h.get('goal_time_diff', 0) != 0]
+            # 着差データのある馬が1頭でもいれば着差圏内比較を行う
+            if all_horses_results and any(h.get('goal_time_diff', 0) != 0 for h in all_horses_results):
+                my_goal_time = next((h['goal_time_diff'] for h in all_horses_results 
+                                   if h.get('last_3f', 0) == my_last_3f), None)
                 
-                if goal_times:
-                    my_goal_time = next((h['goal_time_diff'] for h in all_horses_results 
-                                       if h.get('last_3f', 0) == my_last_3f), None)
+                if my_goal_time is None:
+                    valid_3f = [h['last_3f'] for h in all_horses_results if h.get('last_3f', 0) > 0]
+                    if valid_3f:
+                        race_avg_3f = sum(valid_3f) / len(valid_3f)
+                        comparison_type = "レース全体平均"
+                else:
+                    THRESHOLD = 2.0
+                    nearby_horses_3f = []
+                    valid_3f = []
                     
-                    if my_goal_time is None:
-                        valid_3f = [h['last_3f'] for h in all_horses_results if h.get('last_3f', 0) > 0]
-                        if valid_3f:
-                            race_avg_3f = sum(valid_3f) / len(valid_3f)
-                            comparison_type = "レース全体平均"
-                    else:
-                        THRESHOLD = 2.0
-                        nearby_horses_3f = []
+                    # 圏内馬と全体平均用の上がりを1回の走査で集める
+                    for horse in all_horses_results:
+                        horse_3f = horse.get('last_3f', 0)
+                        goal_diff = horse.get('goal_time_diff', 0) - my_goal_time
                         
-                        for horse in all_horses_results:
-                            horse_3f = horse.get('last_3f', 0)
-                            goal_diff = horse.get('goal_time_diff', 0) - my_goal_time
-                            
-                            if abs(goal_diff) <= THRESHOLD and horse_3f > 0:
+                        if horse_3f > 0:
+                            valid_3f.append(horse_3f)
+                            if abs(goal_diff) <= THRESHOLD:
                                 nearby_horses_3f.append(horse_3f)
-                        
-                        if nearby_horses_3f:
-                            race_avg_3f = sum(nearby_horses_3f) / len(nearby_horses_3f)
-                            comparison_type = f"{THRESHOLD}秒圏内{len(nearby_horses_3f)}頭平均"
-                        else:
-                            valid_3f = [h['last_3f'] for h in all_horses_results if h.get('last_3f', 0) > 0]
-                            if valid_3f:
-                                race_avg_3f = sum(valid_3f) / len(valid_3f)
-                                comparison_type = "レース全体平均（圏内なし）"
+                    
+                    if nearby_horses_3f:
+                        race_avg_3f = sum(nearby_horses_3f) / len(nearby_horses_3f)
+                        comparison_type = f"{THRESHOLD}秒圏内{len(nearby_horses_3f)}頭平均"
+                    elif valid_3f:
+                        race_avg_3f = sum(valid_3f) / len(valid_3f)
+                        comparison_type = "レース全体平均（圏内なし）"
             
-            chakujun = race.get('chakujun', 99)
             speed_diff = race_avg_3f - my_last_3f
             
             # 短距離は1.3秒以内の基準で評価
@@ -1304,33 +1345,15 @@ class RaceScorer:
                     base_points = -3.0
             
             # 重賞レースでの着順評価を緩和
-            grade, base_reliability = self.detect_race_grade(race_name)
+            grade, base_reliability = cols.grade[idx], cols.grade_reliability[idx]
             
-            if grade in ['G1', 'G2', 'G3']:
-                if chakujun == 1:
-                    finish_bonus = 3.0
-                elif chakujun in [2, 3]:
-                    finish_bonus = 2.0
-                elif chakujun in [4, 5]:
-                    finish_bonus = 1.5
-                else:
-                    finish_bonus = 0.0
-            else:
-                if chakujun == 1:
-                    finish_bonus = 3.0
-                elif chakujun == 2:
-                    finish_bonus = 2.0
-                elif chakujun == 3:
-                    finish_bonus = 1.0
-                else:
-                    finish_bonus = 0.0
+            finish_table = self.LAST_3F_FINISH_BONUS_GRADED if grade in ['G1', 'G2', 'G3'] else self.LAST_3F_FINISH_BONUS
+            finish_bonus = finish_table.get(chakujun, 0.0)
             
             # ポイント計算
-            if speed_diff > 0 and finish_bonus > 0:
-                points = base_points + (finish_bonus * 5.0)
-            elif speed_diff > 0:
-                points = base_points * 0.5
-            elif speed_diff <= 0 and finish_bonus > 0:
+            if speed_diff > 0:
+                points = base_points + (finish_bonus * 5.0) if finish_bonus > 0 else base_points * 0.5
+            elif finish_bonus > 0:
                 points = finish_bonus * 3.0
             else:
                 points = -3.0
@@ -1357,28 +1380,31 @@ class RaceScorer:
                             target_baba: str = "良", horse_age: int = None, horse_sex: str = None) -> Dict:
         """総合スコアを計算"""
         
+        # 直近5走の共通項目と判定結果を1回だけ求める
+        cols = self._classify_history(history_data)
+        
         # 1. 上がり3F相対評価
         last_3f_score = self.calculate_last_3f_relative_score(
-            history_data, target_track_type, target_course, target_distance, target_baba
+            history_data, target_track_type, target_course, target_distance, target_baba, cols
         )
         
         # 2. 距離適性スコア
-        distance_score = self._calculate_distance_score(history_data, target_distance)
+        distance_score = self._calculate_distance_score(cols, target_distance)
         
         # 3. コース適性スコア
-        course_score = self._calculate_course_score(history_data, target_course, target_track_type)
+        course_score = self._calculate_course_score(cols, target_course, target_track_type)
         
         # 4. 斤量評価
         weight_penalty = self._calculate_weight_penalty(current_weight, horse_age, horse_sex)
         
         # 5. 後半4F評価
-        late_4f_score = self._calculate_late_4f_score(history_data, target_distance, target_track_type)
+        late_4f_score = self._calculate_late_4f_score(history_data, target_distance, target_track_type, cols)
         
         # 6. 長期休養ペナルティ
         layoff_penalty = self._calculate_layoff_penalty(history_data)
         
         # 7. 重賞出走ボーナス
-        grade_race_bonus = self._calculate_grade_race_bonus(history_data)
+        grade_race_bonus = self._calculate_grade_race_bonus(cols)
         
         # 8. 【新】新馬戦2戦目ブースト
         shinba_boost = self._calculate_shinba_second_race_boost(history_data)
@@ -1400,8 +1426,9 @@ class RaceScorer:
             confidence = running_style_info.get('confidence', 0.0)
             pace = race_pace_prediction.get('pace', 'ミドル')
             
-            raw_bonus = self.style_analyzer.calculate_style_match_bonus(style, pace, target_course, target_distance)
-            style_weight = self.style_analyzer.get_style_weight(target_course, target_distance, style)
+            style_analyzer = self.style_analyzer
+            raw_bonus = style_analyzer.calculate_style_match_bonus(style, pace, target_course, target_distance)
+            style_weight = style_analyzer.get_style_weight(target_course, target_distance, style)
             style_bonus = raw_bonus * confidence * style_weight
             
             if self.debug_mode:
@@ -1409,15 +1436,16 @@ class RaceScorer:
                 logger.debug(f"    生ボーナス{raw_bonus:+.1f} × 信頼度{confidence:.2f} × ウェイト{style_weight:.2f} = {style_bonus:+.2f}")
         
         # 13. 危険フラグ
-        danger_flags = self._check_danger_flags(history_data, target_course, target_track_type)
+        danger_flags = self._check_danger_flags(history_data, target_course, target_track_type, cols)
         danger_penalty = -15.0 if danger_flags['local_to_jra'] else 0.0
         
         # スコア正規化
         is_long_distance = target_distance >= 1800 and target_track_type == "芝"
         
         normalized_3f = min(last_3f_score / 150.0 * 100, 100)
-        normalized_distance = min(distance_score / 15.0 * 100, 100)
-        normalized_course = min(course_score / 15.0 * 100, 100)
+        # 距離・コース適性は各スコア計算で15点にクリップ済み
+        normalized_distance = distance_score / 15.0 * 100
+        normalized_course = course_score / 15.0 * 100
         normalized_style = min(style_bonus / 20.0 * 100, 100)
         normalized_late_4f = min(late_4f_score / 50.0 * 100, 100) if late_4f_score != 0 else 0
         
@@ -1484,6 +1512,37 @@ class RaceScorer:
             'danger_flags': danger_flags
         }
 
+    def calculate_card_scores(self, card: List[Dict], target_course: str, target_distance: int,
+                              target_track_type: str = "芝", race_pace_prediction: Dict = None,
+                              target_baba: str = "良") -> List[Dict]:
+        """
+        出馬表（全頭）をまとめてスコアリング
+        
+        レース単位で共通の条件（コース・距離・トラック・馬場・展開予測）は
+        1回だけ渡し、各馬の過去走だけを順に評価する。
+        展開予測が未指定の場合は出走馬の脚質から1回だけ予測する。
+        
+        Args:
+            card: 各馬の {'current_weight', 'history_data', 'running_style_info'(任意),
+                  'horse_age'(任意), 'horse_sex'(任意)} のリスト
+        
+        Returns:
+            cardと同じ順序のcalculate_total_scoreの結果リスト
+        """
+        if race_pace_prediction is None:
+            styles = [entry['running_style_info'] for entry in card if entry.get('running_style_info')]
+            race_pace_prediction = self.style_analyzer.predict_race_pace(styles, len(card), target_course)
+        
+        return [
+            self.calculate_total_score(
+                entry['current_weight'], target_course, target_distance,
+                entry.get('history_data') or [], target_track_type,
+                entry.get('running_style_info'), race_pace_prediction, target_baba,
+                entry.get('horse_age'), entry.get('horse_sex')
+            )
+            for entry in card
+        ]
+    
     def calculate_total_score_verbose(self, current_weight: float, target_course: str, target_distance: int,
                                       history_data: List[Dict], target_track_type: str = "芝",
                                       running_style_info: Dict = None, race_pace_prediction: Dict = None,
@@ -1541,8 +1600,6 @@ class RaceScorer:
         if not history_data or target_track_type == 'ダート':
             return 0.0
 
-        TIME_WEIGHTS = [1.0, 0.7, 0.5, 0.4, 0.3]
-
         bonus = 0.0
         evaluated = 0
 
@@ -1558,8 +1615,17 @@ class RaceScorer:
             if chakujun == 0 or chakujun >= 90:
                 continue
 
+            # トラックタイプ一致必須（芝/ダートは比較不可）
+            if race_track != target_track_type:
+                continue
+            # 距離差200m以内まで許容
+            dist_diff = abs(race_dist - target_distance)
+            if dist_diff > 200:
+                continue
+
             # goal_secがない場合（scraper_v5）: all_horses_resultsから自馬のgoal_secを直接取得
             # ※ 1着secからgoal_time_diffで逆算すると着差が秒でない場合に異常値になるため禁止
+            # （全馬結果の走査は重いので、トラック・距離で対象外の走は先に除く）
             if goal_sec <= 0:
                 all_results = race.get('all_horses_results', [])
                 my_goal_sec = next(
@@ -1569,13 +1635,6 @@ class RaceScorer:
                 if my_goal_sec > 0:
                     goal_sec = my_goal_sec
 
-            # トラックタイプ一致必須（芝/ダートは比較不可）
-            if race_track != target_track_type:
-                continue
-            # 距離差200m以内まで許容
-            dist_diff = abs(race_dist - target_distance)
-            if dist_diff > 200:
-                continue
             if goal_sec <= 0:
                 continue
 
@@ -1602,7 +1661,7 @@ class RaceScorer:
             # 距離差ペナルティ（200m差で重み×0.8）
             dist_penalty = 0.8 if dist_diff == 200 else 1.0
 
-            w = TIME_WEIGHTS[idx] * dist_penalty
+            w = self.COURSE_RECORD_TIME_WEIGHTS[idx] * dist_penalty
             bonus += pts * w
             evaluated += 1
 
@@ -1623,27 +1682,22 @@ class RaceScorer:
         return result
 
     def _calculate_late_4f_score(self, history_data: List[Dict], target_distance: int, 
-                                  target_track_type: str) -> float:
+                                  target_track_type: str, cols: Optional[HistoryColumns] = None) -> float:
         """後半4F評価（芝中長距離専用）- 実データ使用"""
         if target_track_type != "芝" or target_distance < 1800:
             return 0.0
+        if cols is None:
+            cols = self._classify_history(history_data)
         
         BASELINE_4F = 47.2 if target_distance <= 2000 else 47.8 if target_distance <= 2400 else 48.3
         score = 0.0
         
         for idx, race in enumerate(history_data[:5]):
-            distance = race.get('dist', 0)
-            race_name = race.get('race_name', '')
-            course = race.get('course', '')
-            
-            race_track_type = race.get('track_type', None)
-            if not race_track_type or race_track_type == '不明':
-                race_track_type = self._get_track_type_by_distance(distance, race_name, course)
-            
-            if race_track_type != '芝' or distance < 1800:
+            distance = cols.dist[idx]
+            if distance < 1800 or cols.resolved_track_type[idx] != '芝':
                 continue
             
-            if self._is_local_race(race_name, course):
+            if cols.is_local[idx]:
                 continue
             
             # 実際の後半4Fデータを使用（ラップタイムから計算）
@@ -1651,7 +1705,7 @@ class RaceScorer:
             
             # 後半4Fデータがない場合は上がり3Fから推定（フォールバック）
             if late_4f <= 0:
-                last_3f = race.get('last_3f', 0.0)
+                last_3f = cols.last_3f[idx]
                 if last_3f <= 0:
                     continue
                 # 推定式: 後半4F ≒ 上がり3F × 4/3 + 0.4秒
@@ -1681,27 +1735,12 @@ class RaceScorer:
             
             points = diff_from_baseline * 10.0 * multiplier
             
-            grade, _ = self.detect_race_grade(race_name)
-            reliability_map = {
-                'G1': 1.0, 'G2': 0.95, 'G3': 0.9,
-                'JpnI': 1.0, 'JpnII': 0.95, 'JpnIII': 0.9,
-                'OP': 0.85
-            }
-            reliability = reliability_map.get(grade, 0.7)
+            reliability = self.LATE_4F_RELIABILITY.get(cols.grade[idx], 0.7)
             
             time_decay = 1.0 - (idx * 0.15)
             
-            chakujun = race.get('chakujun', 99)
-            if chakujun == 1:
-                finish_bonus = 1.0
-            elif chakujun <= 3:
-                finish_bonus = 0.9
-            elif chakujun <= 5:
-                finish_bonus = 0.75
-            elif chakujun <= 10:
-                finish_bonus = 0.5
-            else:
-                finish_bonus = 0.3
+            chakujun = cols.chakujun[idx]
+            finish_bonus = 1.0 if chakujun == 1 else self.LATE_4F_FINISH_BONUS[bisect_left(self.FINISH_RANK_LIMITS, chakujun)]
             
             score += points * reliability * time_decay * finish_bonus
         
@@ -1709,7 +1748,7 @@ class RaceScorer:
     
     
     def _check_danger_flags(self, history_data: List[Dict], target_course: str, 
-                           target_track_type: str) -> Dict:
+                           target_track_type: str, cols: Optional[HistoryColumns] = None) -> Dict:
         """危険フラグチェック"""
         flags = {
             'local_to_jra': False,
@@ -1722,16 +1761,13 @@ class RaceScorer:
         
         # 地方→JRA転入チェック
         # 直近5走中4走以上が地方 かつ 直近1走もしくは2走がJRAなら「転入済み」として除外
-        recent_races = history_data[:5]
-        local_count = sum(1 for race in recent_races
-                         if self._is_local_race(race.get('race_name', ''), race.get('course', '')))
+        if cols is None:
+            cols = self._classify_history(history_data)
+        local_count = sum(cols.is_local)
 
         if local_count >= 4:
             # 前走（1走前）がJRAなら転入済み→フラグなし
-            last_race = history_data[0]
-            last_is_local = self._is_local_race(
-                last_race.get('race_name', ''), last_race.get('course', ''))
-            if last_is_local:
+            if cols.is_local[0]:
                 # 前走も地方→まだ転入していない→フラグあり
                 flags['local_to_jra'] = True
             # 前走がJRAなら転入済みとみなしてフラグなし
@@ -1775,7 +1811,6 @@ class RaceScorer:
         crs = result.get('cr_score', 0)
         if crs > 0:
             lines.append(f"  ⏱️CRスコア: +{crs:.1f}点")
-            TIME_WEIGHTS_CR = [1.0, 0.7, 0.5, 0.4, 0.3]
             for idx, race in enumerate(history_data[:5]):
                 rc   = race.get('course', '')
                 rd   = race.get('dist', 0)
@@ -1801,7 +1836,6 @@ class RaceScorer:
                 cr_val = CourseAnalyzer.COURSE_RECORDS.get((rv, rd), 0.0) or \
                          CourseAnalyzer.COURSE_RECORDS.get((rc, rd), 0.0)
                 dist_pen = 0.8 if ddiff == 200 else 1.0
-                w = TIME_WEIGHTS_CR[idx] * dist_pen
                 if cr_val > 0:
                     diff_cr = gs - cr_val
                     lines.append(
@@ -1853,9 +1887,8 @@ class RaceScorer:
                                        horse_age: int = None,
                                        horse_sex: str = None) -> str:
         """スコア内訳を超詳細にフォーマット（計算根拠まで全表示）"""
-        from datetime import datetime
-
         THRESHOLD = 1.1  # 大敗判定閾値
+        recent = history_data[:5] if history_data else []
 
         lines = []
         sep = "=" * 60
@@ -1866,7 +1899,7 @@ class RaceScorer:
         # ─── 上がり3F評価 ────────────────────────────────────────
         lines.append(f"\n▼ 上がり3F評価: {result['last_3f_score']:.1f}点")
         if history_data:
-            for idx, race in enumerate(history_data[:5]):
+            for idx, race in enumerate(recent):
                 dist = race.get('dist', 0)
                 my_3f = race.get('last_3f', 0.0)
                 race_name = race.get('race_name', '')
@@ -1899,7 +1932,7 @@ class RaceScorer:
         # ─── 距離適性 ────────────────────────────────────────
         lines.append(f"\n▼ 距離適性: {result['distance_score']:.1f}点")
         if history_data:
-            for idx, race in enumerate(history_data[:5]):
+            for idx, race in enumerate(recent):
                 dist       = race.get('dist', 0)
                 chakujun   = race.get('chakujun', 99)
                 time_diff  = race.get('goal_time_diff', None)
@@ -1958,7 +1991,7 @@ class RaceScorer:
         # ─── コース適性 ────────────────────────────────────────
         lines.append(f"\n▼ コース適性: {result['course_score']:.1f}点")
         if history_data:
-            for idx, race in enumerate(history_data[:5]):
+            for idx, race in enumerate(recent):
                 course     = race.get('course', '')
                 tt         = race.get('track_type', '')
                 chakujun   = race.get('chakujun', 99)
@@ -2045,7 +2078,7 @@ class RaceScorer:
             date_str = last_race.get('race_date', '')
             if date_str:
                 try:
-                    race_date = datetime.strptime(date_str, '%Y/%m/%d')
+                    race_date = self._parse_race_date(date_str)
                     days = (datetime.now() - race_date).days
                     months = days / 30.44
                     lines.append(f"  前走日: {date_str} → {days}日前 ({months:.1f}ヶ月)")
@@ -2061,7 +2094,7 @@ class RaceScorer:
         lines.append(f"\n▼ 重賞出走ボーナス: +{grb:.1f}点")
         if history_data:
             found = False
-            for idx, race in enumerate(history_data[:5]):
+            for idx, race in enumerate(recent):
                 race_name = race.get('race_name', '')
                 chakujun = race.get('chakujun', 99)
                 grade, _ = self.detect_race_grade(race_name)
@@ -2124,7 +2157,7 @@ class RaceScorer:
         lines.append(f"\n▼ 連勝着差ボーナス: +{wsb:.1f}点")
         if history_data:
             streak = 0
-            for race in history_data[:3]:
+            for race in recent[:3]:
                 if race.get('chakujun', 99) == 1:
                     streak += 1
                 else:
@@ -2132,7 +2165,6 @@ class RaceScorer:
             if streak == 0:
                 lines.append("  （連勝なし）")
             else:
-                TIME_WEIGHTS_WSB = [1.0, 0.7, 0.5]
                 for idx in range(min(streak, 3)):
                     race = history_data[idx]
                     margin = race.get('winner_margin', 0.0)
@@ -2140,16 +2172,15 @@ class RaceScorer:
                         margin = abs(float(race.get('goal_time_diff', 0.0)))
                     label = "楽勝" if margin >= 0.5 else "明確差" if margin >= 0.2 else "接戦"
                     pts = 4.0 if margin >= 0.5 else 2.5 if margin >= 0.2 else 1.5
-                    w = TIME_WEIGHTS_WSB[idx]
+                    w = self.WINNING_STREAK_TIME_WEIGHTS[idx]
                     lines.append(f"  {idx+1}走前 1着 着差{margin:.2f}s ({label}) → {pts:.1f}×{w:.1f} = {pts*w:.2f}点")
 
         # ─── CRスコア ────────────────────────────────────────
         crs = result.get('cr_score', 0)
         lines.append(f"\n▼ CRスコア（コースレコード比較）: +{crs:.1f}点")
         if history_data:
-            TIME_WEIGHTS_CR = [1.0, 0.7, 0.5, 0.4, 0.3]
             evaluated_cr = 0
-            for idx, race in enumerate(history_data[:5]):
+            for idx, race in enumerate(recent):
                 rc   = race.get('course', '')
                 rd   = race.get('dist', 0)
                 rt   = race.get('track_type', '')
@@ -2184,7 +2215,7 @@ class RaceScorer:
                 elif diff_cr <= 4.0: pts_cr = 6.0 - (diff_cr - 2.0) * 2.5
                 else: pts_cr = 0.0
                 dist_pen = 0.8 if ddiff == 200 else 1.0
-                w_cr = TIME_WEIGHTS_CR[idx] * dist_pen
+                w_cr = self.COURSE_RECORD_TIME_WEIGHTS[idx] * dist_pen
                 dist_note = f" (距離差{ddiff}m→重み×{dist_pen})" if ddiff > 0 else ""
                 lines.append(
                     f"  {idx+1}走前 {rc}{rd}m: 走破{gs:.1f}s / CR({rv}){cr_val:.1f}s "
@@ -2224,11 +2255,8 @@ class RaceScorer:
                                 reduce_reason = "前走中止/取消"
                             else:
                                 # 休養明け
-                                from datetime import datetime as _dt
                                 try:
-                                    d1 = _dt.strptime(date, '%Y/%m/%d')
-                                    d2 = _dt.strptime(prev.get('race_date',''), '%Y/%m/%d')
-                                    days = (d1 - d2).days
+                                    days = self._race_day_number(date) - self._race_day_number(prev.get('race_date',''))
                                     reduce_reason = f"休養明け初戦（{days}日ぶり）"
                                 except Exception:
                                     reduce_reason = "軽減条件該当"
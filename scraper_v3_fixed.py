@@ -16,6 +16,7 @@ from bs4 import BeautifulSoup
 import pandas as pd
 import time
 import re
+import sys
 import logging
 import statistics
 from typing import List, Dict, Optional, Tuple
@@ -692,16 +693,17 @@ class NetkeibaRaceScraper:
                         time.sleep(0.3)
                         race_stats = self._get_race_last_3f_stats(race_id)
                     
+                    # コース名・レース名はスコアラーで繰り返し照合するためintern化
                     history.append({
                         'date': date,
-                        'course': course_name,
+                        'course': sys.intern(course_name),
                         'dist': distance,
                         'track_type': race_track_type,  # 追加: 直接パースしたトラックタイプ
                         'chakujun': chakujun,
                         'chakusa': chakusa_text,
                         'weight': weight,
                         'last_3f': last_3f,
-                        'race_name': race_name,
+                        'race_name': sys.intern(race_name),
                         'race_avg_last_3f': race_stats.get('avg_last_3f', 0.0),
                         'race_min_last_3f': race_stats.get('min_last_3f', 0.0),
                         'race_max_last_3f': race_stats.get('max_last_3f', 0.0),
@@ -36,6 +36,7 @@ import time
 import re
 import logging
 import statistics
+import sys
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from collections import Counter
@@ -640,10 +641,11 @@ class NetkeibaRaceScraper:
                 late_4f = self._calculate_late_4f_from_laps(lap_times) if lap_times else 0.0
                 baba = race_stats.get('baba', '良')
 
+                # Scraplingのテキストは str サブクラス（TextHandler）で intern できないため str に戻す
                 history.append({
                     'date': date,
                     'race_date': date,
-                    'course': course_name,
+                    'course': sys.intern(str(course_name)),
                     'dist': distance,
                     'dist_text': dist_text,
                     'track_type': race_track_type,
@@ -656,7 +658,7 @@ class NetkeibaRaceScraper:
                     'weight': weight,
                     'last_3f': last_3f,
                     'late_4f': late_4f,
-                    'race_name': race_name_hist,
+                    'race_name': sys.intern(str(race_name_hist)),
                     'race_avg_last_3f': race_stats.get('avg_last_3f', 0.0),
                     'race_min_last_3f': race_stats.get('min_last_3f', 0.0),
                     'race_max_last_3f': race_stats.get('max_last_3f', 0.0),
@@ -0,0 +1,101 @@
+"""enhanced_scorer_v5 のテスト"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from enhanced_scorer_v5 import EnhancedRaceScorer  # noqa: E402
+
+
+def _race(race_name, course, dist, chakujun, last_3f, goal_time_diff=0.0, weight=56.0):
+    return {
+        'race_name': race_name, 'course': course, 'dist': dist, 'track_type': '芝',
+        'chakujun': chakujun, 'last_3f': last_3f, 'goal_time_diff': goal_time_diff,
+        'weight': weight, 'race_date': '2026/01/10',
+    }
+
+
+CARD = [
+    {
+        'current_weight': 57.0,
+        'history_data': [
+            _race('京都記念(G2)', '京都', 2200, 2, 34.1, 0.1),
+            _race('3勝クラス', '東京', 2000, 1, 33.8),
+        ],
+        'running_style_info': {'style': '先行', 'confidence': 0.8},
+    },
+    {
+        'current_weight': 55.0,
+        'history_data': [
+            _race('2勝クラス', '阪神', 1800, 5, 35.0, 0.6),
+        ],
+        'running_style_info': {'style': '差し', 'confidence': 0.6},
+    },
+    {
+        'current_weight': 56.0,
+        'history_data': [],
+    },
+]
+
+
+def test_card_scores_match_per_horse_scoring():
+    """calculate_card_scores は各馬の calculate_total_score と同じ結果を同じ順序で返す"""
+    scorer = EnhancedRaceScorer()
+    pace = {'pace': 'スロー'}
+
+    results = scorer.calculate_card_scores(CARD, '東京', 2000, '芝', pace)
+
+    expected = [
+        scorer.calculate_total_score(
+            entry['current_weight'], '東京', 2000, entry['history_data'], '芝',
+            entry.get('running_style_info'), pace
+        )
+        for entry in CARD
+    ]
+    assert results == expected
+
+
+def test_card_scores_predict_pace_from_runners():
+    """展開予測が未指定なら出走馬の脚質から1回だけ予測して全頭に使う"""
+    scorer = EnhancedRaceScorer()
+    styles = [entry['running_style_info'] for entry in CARD if entry.get('running_style_info')]
+    pace = scorer.style_analyzer.predict_race_pace(styles, len(CARD), '東京')
+
+    assert scorer.calculate_card_scores(CARD, '東京', 2000) == \
+        scorer.calculate_card_scores(CARD, '東京', 2000, '芝', pace)
+
+
+LOCAL_HISTORY = [
+    {'race_name': 'C1 特別', 'course': '大井', 'dist': 1600, 'track_type': 'ダート',
+     'chakujun': 1, 'last_3f': 38.5, 'weight': 56.0, 'race_date': '2026/01/10'},
+    {'race_name': 'B2 特別', 'course': '川崎', 'dist': 1500, 'track_type': 'ダート',
+     'chakujun': 3, 'last_3f': 39.0, 'goal_time_diff': 0.4, 'weight': 56.0, 'race_date': '2025/12/10'},
+]
+
+
+def test_cutoff_skips_transfer_that_cannot_reach_it():
+    """地方→JRA転入馬は満点でも足切り値に届かなければ詳細評価を省略する"""
+    scorer = EnhancedRaceScorer()
+    full = scorer.calculate_total_score(56.0, '東京', 1600, LOCAL_HISTORY, 'ダート')
+    assert full['danger_flags']['local_to_jra']
+
+    # 上がり3F・斤量×タイムが満点でも重賞実績なし・-15点のペナルティで90点には届かない
+    result = scorer.calculate_total_score(56.0, '東京', 1600, LOCAL_HISTORY, 'ダート', min_score_cutoff=90.0)
+
+    assert result['cutoff'] is True
+    assert result['total_score'] == EnhancedRaceScorer.CUTOFF_TOTAL_SCORE
+    assert result['breakdown'].keys() == full['breakdown'].keys()
+    assert result['breakdown']['last_3f_score'] == 0.0
+    assert result['breakdown']['danger_penalty'] == -15.0
+    scorer.format_score_breakdown(result, 1600)
+
+
+def test_cutoff_keeps_transfer_that_can_reach_it():
+    """足切り値に届く可能性がある転入馬は通常どおり評価する"""
+    scorer = EnhancedRaceScorer()
+    full = scorer.calculate_total_score(56.0, '東京', 1600, LOCAL_HISTORY, 'ダート')
+
+    result = scorer.calculate_total_score(56.0, '東京', 1600, LOCAL_HISTORY, 'ダート', min_score_cutoff=0.0)
+
+    assert 'cutoff' not in result
+    assert result == full
@@ -0,0 +1,70 @@
+"""enhanced_scorer_v7 のテスト"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from enhanced_scorer_v7 import RaceScorer  # noqa: E402
+
+
+def _race(race_name, course, dist, chakujun, last_3f, goal_time_diff=0.0, weight=56.0):
+    return {
+        'race_name': race_name, 'course': course, 'dist': dist, 'track_type': '芝',
+        'chakujun': chakujun, 'last_3f': last_3f, 'goal_time_diff': goal_time_diff,
+        'weight': weight, 'race_date': '2026/01/10',
+    }
+
+
+CARD = [
+    {
+        'current_weight': 57.0,
+        'history_data': [
+            _race('京都記念(G2)', '京都', 2200, 2, 34.1, 0.1),
+            _race('3勝クラス', '東京', 2000, 1, 33.8),
+        ],
+        'running_style_info': {'style': '先行', 'confidence': 0.8},
+        'horse_age': 5,
+        'horse_sex': '牡',
+    },
+    {
+        'current_weight': 55.0,
+        'history_data': [
+            _race('新馬', '阪神', 1800, 1, 34.5),
+        ],
+        'running_style_info': {'style': '差し', 'confidence': 0.6},
+        'horse_age': 3,
+        'horse_sex': '牝',
+    },
+    {
+        'current_weight': 56.0,
+        'history_data': [],
+    },
+]
+
+
+def test_card_scores_match_per_horse_scoring():
+    """calculate_card_scores は各馬の calculate_total_score と同じ結果を同じ順序で返す"""
+    scorer = RaceScorer()
+    pace = {'pace': 'スロー'}
+
+    results = scorer.calculate_card_scores(CARD, '東京', 2000, '芝', pace)
+
+    expected = [
+        scorer.calculate_total_score(
+            entry['current_weight'], '東京', 2000, entry['history_data'], '芝',
+            running_style_info=entry.get('running_style_info'), race_pace_prediction=pace,
+            horse_age=entry.get('horse_age'), horse_sex=entry.get('horse_sex')
+        )
+        for entry in CARD
+    ]
+    assert results == expected
+
+
+def test_card_scores_predict_pace_from_runners():
+    """展開予測が未指定なら出走馬の脚質から1回だけ予測して全頭に使う"""
+    scorer = RaceScorer()
+    styles = [entry['running_style_info'] for entry in CARD if entry.get('running_style_info')]
+    pace = scorer.style_analyzer.predict_race_pace(styles, len(CARD), '東京')
+
+    assert scorer.calculate_card_scores(CARD, '東京', 2000) == \
+        scorer.calculate_card_scores(CARD, '東京', 2000, '芝', pace)
@@ -0,0 +1,49 @@
+"""scraper_v7 戦績パースの回帰テスト"""
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("scrapling")
+pytest.importorskip("pandas")
+pytest.importorskip("requests")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapling.parser import Adaptor  # noqa: E402
+
+from scraper_v7 import NetkeibaRaceScraper  # noqa: E402
+
+
+HISTORY_HTML = """
+<html><body>
+<table class="db_h_race_results">
+  <tr>
+    <th>日付</th><th>開催</th><th>レース名</th><th>距離</th>
+    <th>着順</th><th>斤量</th><th>着差</th><th>上り</th>
+  </tr>
+  <tr>
+    <td>2025/10/05</td><td>ロンシャン</td><td><a href="/race/">凱旋門賞(G1)</a></td><td>芝2400</td>
+    <td>3</td><td>59.5</td><td>0.4</td><td>36.1</td>
+  </tr>
+</table>
+</body></html>
+"""
+
+
+def test_history_row_from_text_handler(monkeypatch):
+    """Scraplingのテキスト（TextHandler）から戦績行が作れること（intern で落ちない）"""
+    scraper = NetkeibaRaceScraper(scraping_delay=0.0)
+    monkeypatch.setattr(scraper, "_fetch_page", lambda url, encoding='EUC-JP': Adaptor(HISTORY_HTML, url=url))
+
+    history = scraper._get_horse_history("2019100000", 57.0, 2400, "東京")
+
+    assert len(history) == 1
+    row = history[0]
+    # 既知の競馬場にない開催名は TextHandler のまま渡ってくる
+    assert row['course'] == "ロンシャン"
+    assert row['race_name'] == "凱旋門賞(G1)"
+    assert type(row['course']) is str
+    assert type(row['race_name']) is str
+    assert row['dist'] == 2400
+    assert row['chakujun'] == 3